@@ -32,6 +32,17 @@ The command line utility `nmr` can be used in three ways:
     cat first.txt second.txt | nmr > out.txt
 
 Each line is determined to be either a name, or a type, and then converted.
+
+4. Scanning files, to replace things inside them with names, or the reverse:
+
+    nmr --scan server.log > named.log
+    nmr --scan --reverse named.log > server.log
+
+5. Naming every position in chess games, or the final position of each game,
+   in PGN files, or EPD files ending in .epd:
+
+    nmr --games openings.pgn > positions.txt
+    nmr --games --final -j 8 database.pgn > finals.txt
 """
 
 app = Typer(
@@ -45,6 +56,34 @@ def nmr_main(
     arguments: list[str] = Argument(
         None, help="Things to convert to names, or vice-versa"
     ),
+    cache_size: int = Option(
+        0,
+        "--cache-size",
+        help="Remember this many recent conversions, for inputs that repeat",
+    ),
+    errors: str = Option(
+        "report",
+        "--errors",
+        help="When used as a pipe, what to do with lines that fail to convert: "
+        "'report' to stderr, 'inline' in the output, or 'ignore'",
+    ),
+    final: bool = Option(
+        False,
+        "--final",
+        help="With --games, only name the final position of each game",
+    ),
+    games: bool = Option(
+        False,
+        "--games",
+        help="Treat the arguments as PGN files, or EPD files if they end in .epd, "
+        "and print the name of each chess position in them",
+    ),
+    jobs: int = Option(
+        1,
+        "--jobs",
+        "-j",
+        help="When used as a pipe or with --games, convert in this many processes",
+    ),
     label: bool = Option(
         False,
         "--label",
@@ -65,6 +104,36 @@ def nmr_main(
         help="If True, don't catch exceptions, allow the program to terminate",
     ),
     random_count: int = Option(0, "--random-count", "-r", help="Print random names"),
+    reverse: bool = Option(
+        False,
+        "--reverse",
+        help="With --scan, replace names after a ~ with the things they name",
+    ),
+    scan: bool = Option(
+        False,
+        "--scan",
+        help="Treat the arguments as files, and print them with each UUID, IP "
+        "address and integer inside them replaced by its name",
+    ),
+    serve: int | None = Option(
+        None,
+        "--serve",
+        help="Serve conversions on this port of localhost, one request per line: "
+        "see nmr/server.py",
+    ),
+    separator: str = Option(
+        "\\n",
+        "--separator",
+        "-s",
+        help="When used as a pipe, the separator between input and output records. "
+        "Backslash escapes like \\0 are allowed",
+    ),
+    stats: bool = Option(
+        False,
+        "--stats",
+        help="Print the calls to and time spent in each stage of conversion to "
+        "stderr",
+    ),
     word_count: int | None = Option(
         None, "--word-count", "-c", help="How many words from the word file to use"
     ),
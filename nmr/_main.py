@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import codecs
+import io
 import random
 import shlex
 import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from functools import cached_property
 from pathlib import Path
 from typing import Any, NoReturn
-from collections.abc import Iterable
 
 import dtyper
 
+from . import stats
 from .__main__ import nmr_main
 from .nmr import Nmr
 from .type_namer import TypeNamer, get_class
@@ -23,24 +28,80 @@ class Main:
 
     # Copied from nmr_main
     arguments: list[str]
+    cache_size: int
+    errors: str
+    final: bool
+    games: bool
+    jobs: int
     label: bool
     output_type: str | None
     raise_exceptions: bool
     random_count: int
+    reverse: bool
+    scan: bool
+    serve: int | None
+    separator: str
+    stats: bool
     word_count: int | None
     word_file: Path | None
 
     def __call__(self) -> None:
-        if self.is_pipe and self.arguments:
+        if self.scan and not self.arguments:
+            raise ValueError("nmr --scan needs files to scan")
+        if self.games and not self.arguments:
+            raise ValueError("nmr --games needs files of games")
+        if self.games and self.scan:
+            raise ValueError("--games and --scan can't be used together")
+        if self.final and not self.games:
+            raise ValueError("--final only works with --games")
+        if self.reverse and not self.scan:
+            raise ValueError("--reverse only works with --scan")
+        if self.serve is not None and (self.arguments or self.scan or self.games):
+            raise ValueError("nmr takes no arguments when --serve is set")
+        if self.is_pipe and self.arguments and not (self.scan or self.games):
             raise ValueError("nmr takes no arguments when used as a pipe")
         if self.random_count and (self.arguments or self.is_pipe):
             raise ValueError("nmr takes no arguments when --random-count is set")
+        if self.errors not in ERROR_POLICIES:
+            raise ValueError(f"--errors must be one of {', '.join(ERROR_POLICIES)}")
+        if not self._separator:
+            raise ValueError("--separator can't be empty")
+
+        if not self.stats:
+            self._run()
+            return
+
+        st = stats.enable()
+        try:
+            self._run()
+        finally:
+            print(st.report(), file=sys.stderr)
+            # Worker processes have their own caches
+            if self.cache_size and self.jobs == 1:
+                print(self.nmr.cache, file=sys.stderr)
+
+    def _run(self) -> None:
+        if self.serve is not None:
+            from . import server
+
+            server.run(self.nmr, self.serve)
+            return
+
+        if self.scan:
+            self._scan()
+            return
+
+        if self.games:
+            self._games()
+            return
+
+        if self.is_pipe:
+            self._pipe()
+            return
 
         lines: Iterable[str]
         if self.arguments:
             lines = [shlex.join(self.arguments)]
-        elif self.is_pipe:
-            lines = sys.stdin
         else:
 
             def _lines() -> Iterable[str]:
@@ -52,30 +113,145 @@ class Main:
 
             lines = _lines()
 
-        for line in lines:
-            if words := line.partition("#")[0].strip():
-                try:
-                    result = self.nmr.convert(words)
-                except Exception as e:
-                    if self.raise_exceptions:
-                        raise
-                    self.returncode = 1
-                    print("ERROR:", e, file=sys.stderr)
-                else:
-                    if not (self.is_pipe or self.arguments):
-                        print("Out: ", end="")
-                    print(result)
+        for r in (_convert(self.nmr, line) for line in lines):
+            if r is None:
+                continue
+            ok, value = r
+            if ok:
+                if not self.arguments:
+                    print("Out: ", end="")
+                print(value)
+            else:
+                self._error(value)
+
+    def _pipe(self) -> None:
+        """Convert stdin to stdout in large blocks, but write out whatever has
+        been converted each time the input runs dry, so `tail -f` works"""
+        sep = self._separator
+        blocks = _read_blocks(sys.stdin.buffer, sep)
+
+        results: Iterable[tuple[Iterable[_Result], bool]]
+        if self.jobs > 1:
+            results = self._convert_parallel(blocks)
+        else:
+            results = (((_convert(self.nmr, r) for r in b), s) for b, s in blocks)
+
+        out: list[str] = []
+        size = 0
+        interactive = sys.stdout.isatty()
+
+        def flush() -> None:
+            nonlocal size
+            text = "".join(out)
+            sys.stdout.buffer.write(text.encode(errors="surrogateescape"))
+            sys.stdout.buffer.flush()
+            out.clear()
+            size = 0
+
+        try:
+            for block, short in results:
+                for r in block:
+                    if r is None:
+                        continue
+                    ok, value = r
+                    if ok:
+                        out.append(value)
+                    elif self._error(value):
+                        out.append(f"ERROR: {value}")
+                    else:
+                        continue
+
+                    out.append(sep)
+                    size += len(out[-2]) + len(sep)
+                    if size >= BUFFER_SIZE:
+                        flush()
+
+                if out and (short or interactive):
+                    flush()
+        finally:
+            flush()
+
+    def _scan(self) -> None:
+        from .scan import Scanner
+
+        scanner = Scanner(self.nmr, self.reverse)
+        for f in self.arguments:
+            scanner.scan_file(f, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+
+    def _games(self) -> None:
+        from .chess_games import GameNamer
+
+        namer = GameNamer(self.nmr, self.final, self.jobs)
+        for f in self.arguments:
+            for ok, value in namer.name_file(f):
+                if ok:
+                    sys.stdout.write(value)
+                elif self._error(value):
+                    sys.stdout.write(f"ERROR: {value}\n")
+        sys.stdout.flush()
+
+    def _error(self, e: Exception) -> bool:
+        """Handle a failed conversion: return True if it should be output inline"""
+        if self.raise_exceptions:
+            raise e
+        self.returncode = 1
+        if self.errors == "report":
+            print("ERROR:", e, file=sys.stderr)
+        return self.errors == "inline"
+
+    def _convert_parallel(
+        self, blocks: Iterable[tuple[list[str], bool]]
+    ) -> Iterator[tuple[list[_Result], bool]]:
+        pool = ProcessPoolExecutor(
+            self.jobs,
+            initializer=_init_worker,
+            initargs=(self.word_file, self.word_count, self.cache_size, self.stats),
+        )
+        with pool:
+            pending: deque[Future[_Chunk]] = deque()
+
+            def results() -> list[_Result]:
+                chunk, chunk_stats = pending.popleft().result()
+                if chunk_stats and stats.STATS is not None:
+                    stats.STATS.merge(chunk_stats)
+                return chunk
+
+            for records, short in blocks:
+                for i in range(0, len(records), CHUNK_SIZE):
+                    chunk = records[i : i + CHUNK_SIZE]
+                    pending.append(pool.submit(_convert_chunk, chunk))
+                    if len(pending) > 2 * self.jobs:
+                        yield results(), False
+
+                if short:
+                    # The input has run dry, so finish everything read so far
+                    while pending:
+                        yield results(), not pending
+
+            while pending:
+                yield results(), not pending
 
     @cached_property
     def nmr(self) -> Nmr:
         from nmr import Nmr
 
-        return Nmr(self.word_file, self.word_count)
+        return Nmr(self.word_file, self.word_count, cache_size=self.cache_size)
 
     @cached_property
     def is_pipe(self) -> bool:
         return not sys.stdin.isatty()
 
+    @cached_property
+    def _separator(self) -> str:
+        # unicode_escape reads bytes as latin-1, so everything but the backslash
+        # escapes is escaped first
+        sep = self.separator.encode("latin-1", "backslashreplace")
+        try:
+            return codecs.decode(sep, "unicode_escape")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Can't read --separator: {e.reason}") from None
+
     @cached_property
     def _type_class(self) -> type[TypeNamer[Any]] | None:
         if self.output_type:
@@ -92,3 +268,67 @@ def exit(*error: Any) -> NoReturn:
     if error:
         print(*error, file=sys.stderr)
     sys.exit(bool(error))
+
+
+ERROR_POLICIES = "report", "inline", "ignore"
+
+# When used as a pipe, input is read and output is written in blocks this big
+BLOCK_SIZE = 0x100000
+BUFFER_SIZE = 0x100000
+
+# The number of lines of input that each worker process converts at a time
+CHUNK_SIZE = 1024
+
+# Either None, for a blank line, or (True, result) or (False, exception)
+_Result = tuple[bool, Any] | None
+
+# The results of converting a chunk in a worker, and the worker's stats, if any
+_Chunk = tuple[list[_Result], dict[str, dict[str, float]] | None]
+
+_WORKER_NMR: Nmr | None = None
+
+
+def _convert(nmr: Nmr, line: str) -> _Result:
+    if words := line.partition("#")[0].strip():
+        try:
+            return True, nmr.convert(words)
+        except Exception as e:
+            return False, e
+    return None
+
+
+def _read_blocks(
+    stream: io.BufferedIOBase, separator: str
+) -> Iterator[tuple[list[str], bool]]:
+    """Yield the complete records in each block of input, and whether that block
+    was short, because no more input was ready yet"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="surrogateescape")
+    rest = ""
+
+    # read1 returns what is available, rather than waiting for a whole block
+    while block := stream.read1(BLOCK_SIZE):
+        *records, rest = (rest + decoder.decode(block)).split(separator)
+        yield records, len(block) < BLOCK_SIZE
+
+    if rest := rest + decoder.decode(b"", final=True):
+        yield [rest], True
+
+
+def _init_worker(
+    word_file: Path | None, word_count: int | None, cache_size: int, use_stats: bool
+) -> None:
+    global _WORKER_NMR
+    _WORKER_NMR = Nmr(word_file, word_count, cache_size=cache_size)
+    if use_stats:
+        stats.enable()
+
+
+def _convert_chunk(lines: list[str]) -> _Chunk:
+    assert _WORKER_NMR is not None
+    results = [_convert(_WORKER_NMR, line) for line in lines]
+
+    if (st := stats.STATS) is None:
+        return results, None
+    chunk_stats = st.as_dict()
+    st.clear()
+    return results, chunk_stats
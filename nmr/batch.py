@@ -0,0 +1,125 @@
+"""
+Encode and decode many numbers or names at once.
+
+If numpy is installed, a batch whose numbers all fit into 64 bits is converted
+with array operations, one column of digits at a time.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .words import Words
+
+UINT64_MAX = 2**64 - 1
+
+
+def encode_many(words: Words, nums: Iterable[int]) -> list[Sequence[str]]:
+    nums = list(nums)
+    if nums and min(nums) >= 0 and max(nums) <= UINT64_MAX and _numpy():
+        return _encode_uint64(words, nums)
+    return [words.encode_to_name(n) for n in nums]
+
+
+def decode_many(words: Words, names: Iterable[Sequence[str]]) -> list[int]:
+    names = list(names)
+    if not (names and _numpy()):
+        return [words.decode_from_name(n) for n in names]
+    return _decode_uint64(words, names)
+
+
+@functools.cache
+def _numpy() -> Any:
+    # numpy is imported lazily, as it is slow to import
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+def _encode_uint64(words: Words, nums: list[int]) -> list[Sequence[str]]:
+    np = _numpy()
+    if (word_count := words._count_words.word_count(max(nums))) is None:
+        return [words.encode_to_name(n) for n in nums]
+
+    totals = np.array([words.count_words(i) for i in range(word_count)], np.uint64)
+    num = np.array(nums, np.uint64)
+    lengths = np.searchsorted(totals, num, side="right")
+    total = num - totals[lengths - 1]
+
+    digits = np.empty((len(nums), word_count), np.int64)
+    for i in range(word_count):
+        radix = np.uint64(words.count - i)
+        digits[:, i] = total % radix
+        total //= radix
+
+    # The vector form of words._undupe: each digit is incremented once for every
+    # earlier index that is less than or equal to it, until that stops changing
+    for i in range(1, word_count):
+        index, earlier = digits[:, i].copy(), digits[:, :i]
+        for _ in range(i + 1):
+            index = digits[:, i] + (earlier <= index[:, None]).sum(axis=1)
+        digits[:, i] = index
+
+    return _split_by_length(words, digits, lengths)
+
+
+def _split_by_length(words: Words, digits: Any, lengths: Any) -> list[Sequence[str]]:
+    np = _numpy()
+    word_array = np.array(words.words, dtype=object)
+    result: list[Sequence[str]] = [[]] * len(lengths)
+
+    for length in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == length)
+        names = word_array[digits[rows, length - 1 :: -1]].tolist()
+        for row, name in zip(rows.tolist(), names, strict=True):
+            result[row] = name
+
+    return result
+
+
+def _decode_uint64(words: Words, names: list[Sequence[str]]) -> list[int]:
+    np = _numpy()
+    max_length = words._count_words.word_count(UINT64_MAX) or words.count
+    result: list[int | None] = [None] * len(names)
+    by_length: dict[int, tuple[list[int], list[list[int]]]] = {}
+
+    for row, name in enumerate(names):
+        name = list(words._maybe_lower(name))
+        indexes = [words.inverse.get(w) for w in name]
+        if 0 < len(name) <= max_length and None not in indexes:
+            rows, table = by_length.setdefault(len(name), ([], []))
+            rows.append(row)
+            table.append(indexes[::-1])  # type: ignore[arg-type]
+
+    for length, (rows, table) in by_length.items():
+        indexes = np.array(table, np.int64)
+
+        # The vector form of words._redupe
+        digits = indexes.copy()
+        for i in range(1, length):
+            digits[:, i] -= (indexes[:, :i] < indexes[:, i, None]).sum(axis=1)
+
+        total = np.zeros(len(rows), np.uint64)
+        overflow = np.zeros(len(rows), bool)
+        for i in reversed(range(length)):
+            radix, digit = np.uint64(words.count - i), digits[:, i].astype(np.uint64)
+            overflow |= total > (np.uint64(UINT64_MAX) - digit) // radix
+            total = total * radix + digit
+
+        offset = np.uint64(words.count_words(length - 1))
+        overflow |= total > np.uint64(UINT64_MAX) - offset
+        total += offset
+
+        for row, n, over in zip(rows, total.tolist(), overflow.tolist(), strict=True):
+            if not over:
+                result[row] = n
+
+    return [
+        words.decode_from_name(name) if n is None else n
+        for name, n in zip(names, result, strict=True)
+    ]
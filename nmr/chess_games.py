@@ -0,0 +1,172 @@
+"""
+Name each position in a file of chess games: every position, or just the final
+one, of each game in a PGN file, or each line of an EPD file.
+
+PGN games are parsed with a visitor that reads the one chess.Board that the
+parser moves through each game, so no FEN string is ever built or parsed, and
+variations are skipped.  EPD lines are all read into one Board.
+
+With more than one job, the main process only splits the file into the text of
+each game, and the games are parsed and named in worker processes.  Results come
+back in the order of the file, a chunk at a time, so they can be written as they
+arrive.
+
+Every name is a full `nmr` name, so `nmr <name>` prints the position's FEN.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import itertools
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import chess
+import chess.pgn
+
+from .category import Game
+from .nmr import Nmr
+from .types.chess import Chess
+
+# Either (True, the text to write for a game or EPD line) or (False, an exception)
+Result = tuple[bool, Any]
+
+# The number of games or EPD lines that each worker process names at a time
+CHUNK_SIZE = 64
+
+# Comments in PGN moves run from { to } or from ; to the end of the line
+_COMMENT = re.compile(r"[{};]")
+
+_WORKER: GameNamer | None = None
+
+
+class GameNamer:
+    def __init__(self, nmr: Nmr, final: bool = False, jobs: int = 1) -> None:
+        self.nmr = nmr
+        self.final = final
+        self.jobs = jobs
+        self._board = chess.Board()
+
+    def name_file(self, path: Path | str) -> Iterator[Result]:
+        """Name the positions in a PGN file, or an EPD file if it ends in .epd"""
+        epd = Path(path).suffix.lower() == ".epd"
+        with open(path, encoding="utf-8-sig", errors="replace") as fp:
+            yield from self.name(fp if epd else split_games(fp), epd)
+
+    def name(self, records: Iterable[str], epd: bool = False) -> Iterator[Result]:
+        """Name the positions in the text of each game, or in each EPD line"""
+        if self.jobs <= 1:
+            results = (self.name_one(r, epd) for r in records)
+            yield from (r for r in results if r is not None)
+            return
+
+        pool = ProcessPoolExecutor(
+            self.jobs,
+            initializer=_init_worker,
+            initargs=(self.nmr.words, self.nmr.ignore_case, self.final),
+        )
+        with pool:
+            pending: deque[Future[list[Result]]] = deque()
+            it = iter(records)
+
+            while chunk := list(itertools.islice(it, CHUNK_SIZE)):
+                pending.append(pool.submit(_name_chunk, chunk, epd))
+                if len(pending) > 2 * self.jobs:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def name_one(self, record: str, epd: bool = False) -> Result | None:
+        """Name one game or EPD line, or return None if there is nothing in it"""
+        try:
+            if epd:
+                if not (line := record.strip()):
+                    return None
+                self._board.set_epd(line)
+                return True, self._name(Chess.type_to_index(self._board)) + "\n"
+
+            visitor = functools.partial(_Positions, self.final)
+            indexes = chess.pgn.read_game(io.StringIO(record), Visitor=visitor)
+        except Exception as e:
+            return False, e
+
+        if not indexes:
+            return None
+        names = "".join(self._name(i) + "\n" for i in indexes)
+        # Every position of a game is followed by a blank line
+        return True, names if self.final else names + "\n"
+
+    def _name(self, index: int) -> str:
+        return " ".join(self.nmr.encode_to_name(Game.CHESS.number_to_index(index)))
+
+
+def split_games(lines: Iterable[str]) -> Iterator[str]:
+    """Split the lines of a PGN file into the text of each game.
+
+    A game ends at a line starting with `[`, the start of a header, that comes
+    after the moves of a game and isn't inside a comment"""
+    game: list[str] = []
+    moves = in_comment = False
+
+    for line in lines:
+        if not in_comment and line.startswith(("[", "%")):
+            if moves and line.startswith("["):
+                yield "".join(game)
+                game.clear()
+                moves = False
+            game.append(line)
+            continue
+
+        game.append(line)
+        moves = moves or bool(line.strip())
+        for m in _COMMENT.finditer(line):
+            if m.group() == "}":
+                in_comment = False
+            elif not in_comment:
+                if m.group() == ";":
+                    break
+                in_comment = True
+
+    if any(line.strip() for line in game):
+        yield "".join(game)
+
+
+class _Positions(chess.pgn.BaseVisitor[Sequence[int]]):
+    """Index the positions in the main line of a game"""
+
+    def __init__(self, final: bool) -> None:
+        self.final = final
+        self.indexes: list[int] = []
+        self.board: chess.Board | None = None
+
+    def begin_variation(self) -> chess.pgn.SkipType:
+        return chess.pgn.SKIP
+
+    def visit_board(self, board: chess.Board) -> None:
+        # The parser moves this same board through the whole game
+        if self.final:
+            self.board = board
+        else:
+            self.indexes.append(Chess.type_to_index(board))
+
+    def result(self) -> Sequence[int]:
+        if self.final and self.board is not None:
+            return [Chess.type_to_index(self.board)]
+        return self.indexes
+
+
+def _init_worker(words: Sequence[str], ignore_case: bool, final: bool) -> None:
+    global _WORKER
+    _WORKER = GameNamer(Nmr(words, ignore_case=ignore_case), final)
+
+
+def _name_chunk(records: list[str], epd: bool) -> list[Result]:
+    assert _WORKER is not None
+    results = (_WORKER.name_one(r, epd) for r in records)
+    return [r for r in results if r is not None]
@@ -1,25 +1,63 @@
 from __future__ import annotations
 
+import bisect
 import threading
 
+# Totals for names up to this many words are computed when a CountWords is made
+PRECOMPUTE = 64
+
+# The longest table of totals yet computed for each number of words.  Tables are
+# tuples that are never changed, only replaced by longer ones, so they can be
+# read without a lock and shared between instances
+_TOTALS: dict[int, tuple[int, ...]] = {}
+_LOCK = threading.Lock()
+
 
 class CountWords:
-    def __init__(self, n: int) -> None:
+    """Count the names of up to `c` words that can be made from `n` words,
+    which is the sum of the falling factorials of `n` up to `c`.
+
+    `totals[c]` is that count, for each `c` computed so far, and is sorted so it
+    can be bisected"""
+
+    totals: tuple[int, ...]
+
+    def __init__(self, n: int, precompute: int = PRECOMPUTE) -> None:
         self.n = n
-        self._perm_count = [(1, 0)]
-        self._lock = threading.Lock()
+        self.totals = _TOTALS.get(n, (0,))
+        if len(self.totals) <= min(precompute, n):
+            self._extend(min(precompute, n))
 
     def count(self, c: int | None = None) -> int:
         if c is None:
             c = self.n
 
-        if len(self._perm_count) - 1 < c:
-            with self._lock:
-                perm, count = self._perm_count[-1]
+        try:
+            return self.totals[c]
+        except IndexError:
+            self._extend(c)
+            return self.totals[c]
+
+    def word_count(self, num: int) -> int | None:
+        """Return the fewest words that can represent `num`, or None if none can"""
+        while self.totals[-1] <= num and (size := len(self.totals)) <= self.n:
+            self._extend(min(2 * size, self.n))
+
+        c = bisect.bisect_right(self.totals, num)
+        return c if c < len(self.totals) else None
 
-                for i in range(len(self._perm_count) - 1, c):
+    def _extend(self, c: int) -> None:
+        with _LOCK:
+            totals = _TOTALS.get(self.n, self.totals)
+            if len(totals) <= c:
+                perm = totals[-1] - totals[-2] if len(totals) > 1 else 1
+                extra = []
+                total = totals[-1]
+                for i in range(len(totals) - 1, c):
                     perm *= self.n - i
-                    count += perm
-                    self._perm_count.append((perm, count))
+                    total += perm
+                    extra.append(total)
+                totals += tuple(extra)
+                _TOTALS[self.n] = totals
 
-        return self._perm_count[c][1]
+            self.totals = totals
@@ -0,0 +1,41 @@
+"""
+A Fenwick tree that tracks which of the numbers 0, 1, ..., size - 1 are in use,
+so that both ranking and unranking a number among the unused ones is O(log size)
+
+https://en.wikipedia.org/wiki/Fenwick_tree
+"""
+
+from __future__ import annotations
+
+
+class Fenwick:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tree = [0] * (size + 1)
+        self._top = 1 << size.bit_length()
+
+    def add(self, i: int) -> None:
+        """Mark `i` as used"""
+        i += 1
+        while i <= self.size:
+            self._tree[i] += 1
+            i += i & -i
+
+    def used_below(self, i: int) -> int:
+        """Return how many used numbers are less than `i`"""
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def unused(self, n: int) -> int:
+        """Return the `n`-th smallest unused number, counting from zero"""
+        pos = 0
+        step = self._top
+        while step:
+            if (p := pos + step) <= self.size and (free := step - self._tree[p]) <= n:
+                pos = p
+                n -= free
+            step >>= 1
+        return pos
@@ -1,17 +1,51 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from functools import partial
+from pathlib import Path
 
-from . import types
+from . import stats, types
+from .cache import LRUCache
 from .words import Words
 
 
 class Nmr(Words):
     """Nmr handles encoding integers to names, and decoding names into integers.
 
-    The exact correspondence depends on the choice and number of words
+    The exact correspondence depends on the choice and number of words.
+
+    If `cache_size` is set, `convert`, `encode_to_name` and `decode_from_name`
+    remember up to that many of their most recent results in `self.cache`
     """
 
+    cache: LRUCache | None
+
+    def __init__(
+        self,
+        words: Sequence[str] | Path | None = None,
+        count: int | None = None,
+        ignore_case: bool = True,
+        cache_size: int = 0,
+    ) -> None:
+        super().__init__(words, count, ignore_case)
+        self.cache = LRUCache(cache_size) if cache_size else None
+
+    def decode_from_name(self, name: Sequence[str]) -> int:
+        if self.cache is None:
+            return super().decode_from_name(name)
+        name = tuple(name)
+        return self.cache.get(("decode", name), partial(super().decode_from_name, name))
+
+    def encode_to_name(self, num: int) -> Sequence[str]:
+        if self.cache is None:
+            return super().encode_to_name(num)
+
+        def encode() -> tuple[str, ...]:
+            return tuple(super(Nmr, self).encode_to_name(num))
+
+        # Callers get their own list, which they can change
+        return list(self.cache.get(("encode", num), encode))
+
     def name_to_str(self, name: Sequence[str]) -> str:
         """Given a name, a sequence of strings from `self.words`"""
         index = self.decode_from_name(name)
@@ -19,9 +53,21 @@ class Nmr(Words):
 
     def str_to_name(self, s: str) -> Sequence[str]:
         index = types.str_to_index(s)
-        return self.encode_to_name(index)
+        # Skip the encode cache: convert caches its whole results instead
+        return super().encode_to_name(index)
 
     def convert(self, s: str) -> str:
-        if self.is_name(split := s.split()):
-            return self.name_to_str(split)
-        return " ".join(self.str_to_name(s))
+        convert = stats.timed(self._convert, "convert")
+        if self.cache is None:
+            return convert(s)
+        return self.cache.get(("convert", s), partial(convert, s))
+
+    def _convert(self, s: str) -> str:
+        if (indexes := stats.timed(self.word_index.indexes, "is_name")(s)) is not None:
+            index = stats.timed(self._from_indexes, "decode_from_name")(indexes)
+            return types.index_to_str(index)
+
+        index = stats.timed(types.str_to_index, "str_to_index")(s)
+        # Skip the encode cache: convert caches its whole results instead
+        encode = stats.timed(super().encode_to_name, "encode_to_name")
+        return " ".join(encode(index))
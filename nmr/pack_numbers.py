@@ -1,6 +1,5 @@
 import dataclasses as dc
 import math
-from collections.abc import Sequence
 
 """
 A module for packing n numbers into a single number
@@ -21,33 +20,110 @@ class Packer:
         if len(numbers) != self.count:
             raise ValueError(f"{len(numbers)=} != {self.count=}")
 
-        return self._pack(numbers)
+        if self.forward:
+            *rest, total = numbers
+            for x in reversed(rest):
+                total = _cantor(x, total)
+        else:
+            total, *rest = numbers
+            for y in rest:
+                total = _cantor(total, y)
+
+        return total
 
     def unpack(self, n: int) -> list[int]:
-        return self._unpack(n, self.count)
+        result = []
+        for _ in range(self.count - 1):
+            if self.forward:
+                x, n = _inverse_cantor(n)
+                result.append(x)
+            else:
+                n, y = _inverse_cantor(n)
+                result.append(y)
+        result.append(n)
 
-    def _pack(self, a: Sequence[int]) -> int:
-        if len(a) == 1:
-            return a[0]
+        return result if self.forward else result[::-1]
 
-        if self.forward:
-            x, *rest = a
-            y = self._pack(rest)
-        else:
-            *rest, y = a
-            x = self._pack(rest)
 
-        return _cantor(x, y)
+@dc.dataclass(frozen=True)
+class BalancedPacker:
+    """Pack n numbers in order of their sum, and lexicographically among tuples
+    with the same sum, so that no number grows much faster than the others.
 
-    def _unpack(self, n: int, count: int) -> list[int]:
-        if count == 1:
-            return [n]
+    Ranks are computed directly with the combinatorial number system:
+    https://en.wikipedia.org/wiki/Combinatorial_number_system
+    """
 
-        x, y = _inverse_cantor(n)
-        if self.forward:
-            return [x] + self._unpack(y, count - 1)
-        else:
-            return self._unpack(x, count - 1) + [y]
+    count: int
+
+    def __post_init__(self) -> None:
+        assert self.count >= 1
+
+    def pack(self, *numbers: int) -> int:
+        if len(numbers) != self.count:
+            raise ValueError(f"{len(numbers)=} != {self.count=}")
+        if any(i < 0 for i in numbers):
+            raise ValueError(f"Negative numbers cannot be packed: {numbers}")
+
+        remains = sum(numbers)
+        total = _below(remains, self.count)
+
+        for i, x in enumerate(numbers[:-1]):
+            k = self.count - i - 1
+            total += _at_most(remains, k) - _at_most(remains - x, k)
+            remains -= x
+
+        return total
+
+    def unpack(self, n: int) -> list[int]:
+        if n < 0:
+            raise ValueError(f"Negative numbers cannot be unpacked: {n}")
+
+        remains = _smallest_sum(n + 1, self.count)
+        n -= _below(remains, self.count)
+        result = []
+
+        for i in range(self.count - 1):
+            k = self.count - i - 1
+            # The number of tuples with the same sum from this one onward
+            after = _at_most(remains, k) - n
+            x = remains - _smallest_sum(after, k)
+
+            n -= _at_most(remains, k) - _at_most(remains - x, k)
+            remains -= x
+            result.append(x)
+
+        result.append(remains)
+        return result
+
+
+def _at_most(s: int, n: int) -> int:
+    """The number of n-tuples with a sum of at most s"""
+    return math.comb(s + n, n)
+
+
+def _below(s: int, n: int) -> int:
+    """The number of n-tuples with a sum less than s"""
+    return _at_most(s - 1, n) if s else 0
+
+
+def _smallest_sum(count: int, n: int) -> int:
+    """The smallest s with at least `count` n-tuples whose sum is at most s"""
+    # n! * _at_most(s, n) lies between (s + 1) ** n and (s + n) ** n
+    s = max(0, _iroot(math.factorial(n) * count, n) - n)
+    while _at_most(s, n) < count:
+        s += 1
+    return s
+
+
+def _iroot(x: int, n: int) -> int:
+    """The largest r with r ** n <= x"""
+    if not x:
+        return 0
+    r = 1 << -(-x.bit_length() // n)
+    while (y := ((n - 1) * r + x // r ** (n - 1)) // n) < r:
+        r = y
+    return r
 
 
 # https://en.wikipedia.org/wiki/Pairing_function#Cantor_pairing_function
@@ -58,7 +134,7 @@ def _cantor(x: int, y: int) -> int:
 
 
 def _inverse_cantor(z: int) -> tuple[int, int]:
-    w = int((math.sqrt(8 * z + 1) - 1) / 2)
+    w = (math.isqrt(8 * z + 1) - 1) // 2
     t = (w * w + w) // 2
     y = z - t
     x = w - y
@@ -69,6 +145,7 @@ if __name__ == "__main__":
     packers = (
         Packer(3, False),
         Packer(3, True),
+        BalancedPacker(3),
     )
 
     for i in range(64):
@@ -76,10 +153,10 @@ if __name__ == "__main__":
 
 
 """
-The results aren't very aesthetic, because the recursive definition above means some
-digits increase much faster than others.
+Packer's results aren't very aesthetic, because the recursive definition above means
+some digits increase much faster than others.
 
-WANT something like:
+BalancedPacker packs in this order instead:
 [0, 0, 0]
 
 [0, 0, 1]
@@ -123,16 +200,11 @@ WANT something like:
 [0, 0, 0]
 
 
-C(i, n)
-C(0, 0) = 1
-
-C(i, n) = sum(C(j, n-1) for j in [1, i - 1]?
-
-[5] + i for i in
-
-...
+There are C(s + n, n) n-tuples with a sum of at most s, so the tuples with sum s start
+at C(s + n - 1, n), and each number in a tuple skips past the tuples with a smaller
+number at that place, which another sum of binomials counts.
 
-ACTUAL:
+ACTUAL for Packer:
 
 forward: False  True
  0 [0, 0, 0] [0, 0, 0]
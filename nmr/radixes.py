@@ -1,19 +1,177 @@
+import itertools
+import math
+import operator
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from . import batch
+
+# Straight-line code is only generated for Radixes with at most this many radixes,
+# as longer code is slow to compile, and nests too deeply for the compiler
+GENERATED_RADIXES = 64
+
+
 class Radixes:
+    """Mixed-radix numbers with a fixed list of radixes.
+
+    encode(top, *digits) takes one digit for each radix, most significant first,
+    after the top digit, which is unbounded.  decode() is its inverse.
+
+    Straight-line code for both is generated when a Radixes with at most
+    GENERATED_RADIXES radixes is made, with the place value of each digit worked
+    out in advance.  Longer Radixes use loops."""
+
+    encode: Callable[..., int]
+    decode: Callable[[int], list[int]]
+
     def __init__(self, *radixes: int) -> None:
         self.radixes = radixes
 
-    def encode(self, *digits: int) -> int:
+        # The place value of the top digit, then of each other digit
+        places = itertools.accumulate(reversed(radixes), operator.mul, initial=1)
+        self.places = tuple(places)[::-1]
+
+        if len(radixes) > GENERATED_RADIXES:
+            self.encode = self._encode
+            self.decode = self._decode
+            return
+
+        namespace: dict[str, Any] = {}
+        exec(_encoder(self.places), namespace)
+        exec(_decoder(radixes), namespace)
+        self.encode = namespace["encode"]
+        self.decode = namespace["decode"]
+
+    def encode_many(self, rows: Iterable[Sequence[int]]) -> list[int]:
+        # Converting the rows to numpy arrays costs as much as encoding them here
+        return list(itertools.starmap(self.encode, rows))
+
+    def decode_many(self, nums: Iterable[int]) -> list[list[int]]:
+        """Decode many numbers at once, with numpy if it is installed and every
+        number and radix fits into 64 bits"""
+        nums = list(nums)
+        fits = self.places[0] <= batch.UINT64_MAX
+        if not (fits and nums and min(nums) >= 0 and max(nums) <= batch.UINT64_MAX):
+            return [self.decode(n) for n in nums]
+        if (np := batch._numpy()) is None:  # pragma: no cover
+            return [self.decode(n) for n in nums]
+
+        total = np.array(nums, np.uint64)
+        columns = []
+        for radix in reversed(self.radixes):
+            total, digits = np.divmod(total, np.uint64(radix))
+            columns.append(digits.tolist())
+        columns.append(total.tolist())
+        return [list(row) for row in zip(*reversed(columns))]
+
+    def _encode(self, *digits: int) -> int:
         total, *digit = digits
         assert len(digit) == len(self.radixes)
 
-        for d, r in zip(digit, self.radixes, strict=False):
+        for d, r in zip(digit, self.radixes):
             total = r * total + d
         return total
 
-    def decode(self, n: int) -> list[int]:
+    def _decode(self, n: int) -> list[int]:
         parts = []
         for radix in reversed(self.radixes):
             n, rem = divmod(n, radix)
             parts.append(rem)
         parts.append(n)
         return parts[::-1]
+
+
+def _encoder(places: Sequence[int]) -> str:
+    digits = [f"d{i}" for i in range(len(places))]
+    terms = [d if p == 1 else f"{p} * {d}" for d, p in zip(digits, places)]
+    return f"def encode({', '.join(digits)}):\n    return {' + '.join(terms)}"
+
+
+def _decoder(radixes: Sequence[int]) -> str:
+    lines = ["def decode(n):"]
+    for i, radix in reversed(list(enumerate(radixes, 1))):
+        lines.append(f"    n, d{i} = divmod(n, {radix})")
+    digits = ", ".join(f"d{i}" for i in range(1, len(radixes) + 1))
+    lines.append(f"    return [n, {digits}]" if radixes else "    return [n]")
+    return "\n".join(lines)
+
+
+# Mixed-radix numbers with more digits than this are split and joined by divide
+# and conquer, which is subquadratic in the size of the number
+SMALL_RADIXES = 64
+
+
+def split(n: int, radixes: Sequence[int]) -> list[int]:
+    """Split `n` into digits, least significant first, where the i-th digit is
+    less than `radixes[i]`"""
+    if len(radixes) <= SMALL_RADIXES:
+        digits = []
+        for r in radixes:
+            n, d = divmod(n, r)
+            digits.append(d)
+    else:
+        tree = _product_tree(radixes)
+        if n >= tree[0]:
+            raise ValueError(f"{n} is too large for {len(radixes)} radixes")
+        digits = []
+        _split(n, tree, digits)
+        n = 0
+
+    if n:
+        raise ValueError(f"{n} is too large for {len(radixes)} radixes")
+    return digits
+
+
+def join(digits: Sequence[int], radixes: Sequence[int]) -> int:
+    """The inverse of `split`"""
+    assert len(digits) == len(radixes)
+    return _join(digits, radixes)[0]
+
+
+_ProductTree = tuple[int, Any, Any]
+
+
+def _product_tree(radixes: Sequence[int]) -> _ProductTree:
+    if len(radixes) <= SMALL_RADIXES:
+        return _product(radixes), radixes, None
+
+    mid = len(radixes) // 2
+    low, high = _product_tree(radixes[:mid]), _product_tree(radixes[mid:])
+    return low[0] * high[0], low, high
+
+
+def _split(n: int, tree: _ProductTree, digits: list[int]) -> None:
+    _, low, high = tree
+    if high is None:
+        for r in low:
+            n, d = divmod(n, r)
+            digits.append(d)
+    else:
+        n, rem = divmod(n, low[0])
+        _split(rem, low, digits)
+        _split(n, high, digits)
+
+
+def _join(digits: Sequence[int], radixes: Sequence[int]) -> tuple[int, int]:
+    if len(radixes) <= SMALL_RADIXES:
+        total = 0
+        for d, r in zip(reversed(digits), reversed(radixes)):
+            total = total * r + d
+        return total, _product(radixes)
+
+    mid = len(radixes) // 2
+    return _combine(
+        _join(digits[:mid], radixes[:mid]), _join(digits[mid:], radixes[mid:])
+    )
+
+
+def _combine(low: tuple[int, int], high: tuple[int, int]) -> tuple[int, int]:
+    """Combine the values and products of two neighbouring runs of digits"""
+    return low[0] + low[1] * high[0], low[1] * high[1]
+
+
+def _product(radixes: Sequence[int]) -> int:
+    # Words uses descending ranges, whose products are falling factorials
+    if isinstance(radixes, range) and radixes.step == -1 and radixes.stop >= -1:
+        return math.perm(radixes.start, len(radixes))
+    return math.prod(radixes)
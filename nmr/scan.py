@@ -0,0 +1,155 @@
+"""
+Replace the things inside a large text file with their names, or the reverse.
+
+The file is memory-mapped and searched with one compiled bytes regular expression,
+and the text between matches is written straight from the map, so no string is
+built for each line.  Files that can't be mapped, like pipes, are read whole.
+
+Each thing found is named exactly as `Nmr.convert` would name it, so an integer
+gets the name of the fraction with that value, as fractions are tried first.
+Only canonical forms are replaced: `10.0.0.1` is, but `010.0.0.1` and uppercase
+UUIDs are not.  The words of each name are joined with `-`, a name must have at
+least `min_words` words, and each name follows a marker, `~`, so that ordinary
+text like `type-name` is never read as a name.  Each marker already in the text
+is doubled, and the reverse scan undoubles it, so scanning any file and then
+scanning the result in reverse restores the original.
+"""
+
+from __future__ import annotations
+
+import functools
+import mmap
+import re
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from . import types
+from .nmr import Nmr
+
+# Each kind of thing that can be found, in the order they are tried
+PATTERNS = {
+    "uuid": rb"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+    "ip_v6_address": rb"[0-9a-f]{0,4}(?::[0-9a-f]{0,4}){2,7}",
+    "ip_v4_address": rb"[0-9]{1,3}(?:\.[0-9]{1,3}){3}",
+    "integer": rb"0|[1-9][0-9]*",
+}
+KINDS = tuple(PATTERNS)
+
+# A match must not be part of a longer word, number or address
+_BEFORE = rb"(?<![\w.:-])"
+_AFTER = rb"(?![\w:-]|\.\w)"
+
+CACHE_SIZE = 0x10000
+
+
+class Scanner:
+    def __init__(
+        self,
+        nmr: Nmr,
+        reverse: bool = False,
+        kinds: Sequence[str] = KINDS,
+        separator: str = "-",
+        min_words: int = 2,
+        marker: str = "~",
+    ) -> None:
+        if bad := [k for k in kinds if k not in PATTERNS]:
+            raise ValueError(f"Cannot scan for {', '.join(bad)}")
+        if not marker or marker in separator or re.search(r"\w", marker):
+            raise ValueError(f"Bad {marker=}")
+
+        self.nmr = nmr
+        self.reverse = reverse
+        self.kinds = kinds
+        self.separator = separator
+        self.min_words = min_words
+        self.marker = marker
+
+        # Logs repeat the same addresses and ids, so conversions are cached
+        self._convert = functools.lru_cache(CACHE_SIZE)(
+            self._decode if reverse else self._encode
+        )
+
+    def scan(self, data: Any, out: BinaryIO) -> int:
+        """Write `data`, a bytes-like object, to `out` with each match replaced,
+        and return the number of replacements"""
+        view = memoryview(data)
+        pos = count = 0
+
+        try:
+            for m in self.pattern.finditer(data):
+                if m.lastgroup == "marker":
+                    r = (self.marker if self.reverse else 2 * self.marker).encode()
+                elif (r := self._convert(m.lastgroup, m.group(m.lastgroup))) is None:
+                    continue
+                else:
+                    count += 1
+                out.write(view[pos : m.start()])
+                out.write(r)
+                pos = m.end()
+            out.write(view[pos:])
+        finally:
+            view.release()
+
+        return count
+
+    def scan_file(self, path: Path | str, out: BinaryIO) -> int:
+        with open(path, "rb") as fp:
+            try:
+                mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Empty files and pipes can't be mapped
+                return self.scan(fp.read(), out)
+            with mm:
+                return self.scan(mm, out)
+
+    @functools.cached_property
+    def pattern(self) -> re.Pattern[bytes]:
+        marker = re.escape(self.marker.encode())
+        if self.reverse:
+            # A doubled marker is tried first, so it is never read as a name
+            sep = self.separator.encode()
+            name = self.nmr.word_index.pattern(sep, self.min_words)
+            markers = b"(?P<marker>%s%s)" % (marker, marker)
+            s = markers + b"|" + marker + b"(?P<name>%s)" % name.pattern
+            return re.compile(s, name.flags)
+
+        parts = (b"(?P<%s>%s)" % (k.encode(), PATTERNS[k]) for k in self.kinds)
+        things = _BEFORE + b"(?:" + b"|".join(parts) + b")" + _AFTER
+        return re.compile(b"(?P<marker>%s)|" % marker + things)
+
+    def _encode(self, kind: str, text: bytes) -> bytes | None:
+        s = text.decode()
+        try:
+            index = types.str_to_index(s)
+        except ValueError:
+            return None
+        if types.index_to_str(index) != s:
+            return None
+
+        name = self.nmr.encode_to_name(index)
+        if len(name) < self.min_words:
+            return None
+        return (self.marker + self.separator.join(name)).encode()
+
+    def _decode(self, kind: str, text: bytes) -> bytes | None:
+        name = text.decode()
+        if self.nmr.ignore_case and name != name.lower():
+            return None
+        if (indexes := self.nmr.word_index.indexes(name.split(self.separator))) is None:
+            return None
+
+        index = self.nmr._from_indexes(indexes)
+        try:
+            s = types.index_to_str(index)
+        except Exception:
+            return None
+
+        # Only names that a forward scan would have written are replaced
+        if not self._kinds.fullmatch(s.encode()) or types.str_to_index(s) != index:
+            return None
+        return s.encode()
+
+    @functools.cached_property
+    def _kinds(self) -> re.Pattern[bytes]:
+        return re.compile(b"|".join(PATTERNS[k] for k in self.kinds))
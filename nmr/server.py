@@ -0,0 +1,143 @@
+"""
+Serve conversions over a socket from one long-lived Nmr.
+
+The protocol is one request per line, encoded in UTF-8:
+
+    convert <a thing or a name>
+    encode <a non-negative integer>
+    decode <a name>
+
+and one response per line, in the same order as the requests:
+
+    OK <result>
+    ERROR <message>
+
+Clients can send many requests without waiting for responses.  Small requests are
+converted on the event loop, and large ones in a thread pool so they don't hold
+up other connections.  Each connection has at most `max_pending` requests in
+flight: after that, the server stops reading from it until responses are sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+from .nmr import Nmr
+
+HOST = "127.0.0.1"
+
+# Requests longer than this are converted in the executor
+HEAVY_SIZE = 1024
+
+MAX_LINE = 0x1000000
+MAX_PENDING = 256
+
+
+class Server:
+    def __init__(
+        self,
+        nmr: Nmr,
+        executor: Executor | None = None,
+        heavy_size: int = HEAVY_SIZE,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self.nmr = nmr
+        self.executor = executor or ThreadPoolExecutor()
+        self.heavy_size = heavy_size
+        self.max_pending = max_pending
+        self.commands: dict[str, Callable[[str], str]] = {
+            "convert": nmr.convert,
+            "decode": lambda s: str(nmr.decode_from_name(s.split())),
+            "encode": lambda s: " ".join(nmr.encode_to_name(int(s))),
+        }
+
+    async def start(self, host: str = HOST, port: int = 0) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        pending: asyncio.Queue[asyncio.Future[str] | None]
+        pending = asyncio.Queue(self.max_pending)
+        responder = asyncio.create_task(self._respond(pending, writer))
+
+        try:
+            while line := await reader.readline():
+                # Blocks while too many responses are waiting to be sent
+                await pending.put(self._request(line))
+        except (ConnectionError, ValueError) as e:
+            # ValueError means a line was longer than MAX_LINE
+            await pending.put(_done(f"ERROR {_one_line(e)}"))
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def response(self, line: str) -> str:
+        """Return the response to one request"""
+        command, _, arg = line.strip().partition(" ")
+        if (f := self.commands.get(command)) is None:
+            return f"ERROR Unknown command '{command}'"
+        try:
+            return f"OK {f(arg.strip())}"
+        except Exception as e:
+            return f"ERROR {_one_line(e)}"
+
+    def _request(self, data: bytes) -> asyncio.Future[str]:
+        line = data.decode(errors="replace")
+        if len(line) <= self.heavy_size:
+            return _done(self.response(line))
+
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, self.response, line)
+
+    async def _respond(
+        self,
+        pending: asyncio.Queue[asyncio.Future[str] | None],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        connected = True
+        while (future := await pending.get()) is not None:
+            response = await future
+            if connected:
+                try:
+                    writer.write(response.encode() + b"\n")
+                    # Waits while the client is slow to read
+                    await writer.drain()
+                except ConnectionError:
+                    # Keep emptying the queue, so the reader is never blocked
+                    connected = False
+
+
+def run(nmr: Nmr, port: int, host: str = HOST) -> None:
+    """Serve forever"""
+
+    async def serve() -> None:
+        server = await Server(nmr).start(host, port)
+        for s in server.sockets:
+            host_port = s.getsockname()[:2]
+            print("Serving on {}:{}".format(*host_port), file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def _done(result: Any) -> asyncio.Future[Any]:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(result)
+    return future
+
+
+def _one_line(e: Exception) -> str:
+    return " ".join(str(e).split()) or e.__class__.__name__
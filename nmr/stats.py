@@ -0,0 +1,101 @@
+"""
+Count the calls to each stage of a conversion, and the time spent in each.
+
+Stats are off unless the environment variable NMR_STATS is set or `enable()` is
+called.  Instrumented code calls each stage through `timed()`, which returns
+the function it is given, unwrapped, while stats are off and `STATS` is None, so
+there is only one code path, and it costs one function call per stage.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, TypeVar, cast
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.counts[stage] = self.counts.get(stage, 0) + count
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                k: {"count": v, "seconds": self.seconds[k]}
+                for k, v in self.counts.items()
+            }
+
+    def merge(self, d: Mapping[str, Mapping[str, float]]) -> None:
+        """Add in stats from `as_dict()`, perhaps from another process"""
+        for stage, s in d.items():
+            self.add(stage, s["seconds"], int(s["count"]))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counts.clear()
+            self.seconds.clear()
+
+    def report(self) -> str:
+        """Return a table of stages, slowest first"""
+        rows = sorted(self.as_dict().items(), key=lambda i: -i[1]["seconds"])
+        width = max((len(k) for k, _ in rows), default=0)
+        lines = [f"{'stage':{width}}  {'calls':>9}  {'total ms':>10}  {'mean µs':>9}"]
+        for stage, s in rows:
+            count, seconds = s["count"], s["seconds"]
+            lines.append(
+                f"{stage:{width}}  {count:9}  {seconds * 1e3:10.3f}  "
+                f"{seconds * 1e6 / count:9.2f}"
+            )
+        return "\n".join(lines)
+
+
+STATS: Stats | None = Stats() if os.environ.get("NMR_STATS") else None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def timed(f: F, stage: str, namer: type | None = None) -> F:
+    """Return `f`, timed as a stage of a conversion, or of a namer, if stats are on"""
+    if (st := STATS) is None:
+        return f
+    if namer is not None:
+        stage = f"{namer.__name__}.{stage}"
+
+    def wrapper(*args: Any) -> Any:
+        with st.time(stage):
+            return f(*args)
+
+    return cast(F, wrapper)
+
+
+def enable() -> Stats:
+    """Start collecting stats, if they aren't already, and return them"""
+    global STATS
+    if STATS is None:
+        STATS = Stats()
+    return STATS
+
+
+def disable() -> Stats | None:
+    """Stop collecting stats, and return the ones that were collected"""
+    global STATS
+    stats, STATS = STATS, None
+    return stats
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import Any, Generic, TypeVar, cast, get_args
 
 from .category import Subcategory
@@ -18,6 +19,9 @@ class TypeNamer(Generic[DataType]):
 
     category: Subcategory
 
+    # If set, str_to_type is only tried on strings that fullmatch this pattern
+    pattern: re.Pattern[str] | None = None
+
     @classmethod
     def index_to_type(cls, i: int) -> DataType:
         """Given an index, construct a DataType for it, or raise a RuntimeError"""
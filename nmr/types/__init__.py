@@ -1,37 +1,125 @@
 from __future__ import annotations
 
-from typing import cast
+import importlib
+import re
+from collections.abc import Iterator
+from typing import Any, NamedTuple
 
-from ..category import Category, make_category
+from .. import stats
+from ..category import Computer, Game, Location, Math, Subcategory, make_category
 from ..type_namer import TypeNamer
-from .fraction import Fraction
-from .integer import Integer
-from .ip_address import IPv4Address, IPv6Address
-from .lat_long import LatLong
-from .sem_ver import Semver
-from .uuid import Uuid
+
+
+class Entry(NamedTuple):
+    category: Subcategory
+    module: str
+    class_name: str
+
+    # str_to_type is only tried on strings that fullmatch this pattern
+    pattern: re.Pattern[str]
+
+
+def _entry(category: Subcategory, module: str, class_name: str, pattern: str) -> Entry:
+    return Entry(category, module, class_name, re.compile(pattern, re.DOTALL))
+
+
+# The built-in namers, in the order that str_to_index tries them.  Categories are
+# IntEnums whose values collide, so they are keyed by name, like
+# TypeNamer.SUBCLASSES.
+#
+# A namer's module is only imported when that namer is first used, and each
+# pattern is a cheap test that accepts every string the namer could parse.
+REGISTRY: dict[str, Entry] = {
+    e.category.name.lower(): e
+    for e in (
+        _entry(
+            Math.FRACTION,
+            "fraction",
+            "Fraction",
+            r"\s*[-+]?(?=\.?\d)[\d_]*"
+            r"(?:\s*/\s*[\d_]+|(?:\.[\d_]*)?(?:[eE][-+]?[\d_]+)?)\s*",
+        ),
+        _entry(Math.INTEGER, "integer", "Integer", r"\s*[-+]?\d[\d_]*\s*"),
+        _entry(
+            Computer.IP_V4_ADDRESS,
+            "ip_address",
+            "IPv4Address",
+            r"[0-9]{1,3}(?:\.[0-9]{1,3}){3}",
+        ),
+        _entry(
+            Computer.IP_V6_ADDRESS,
+            "ip_address",
+            "IPv6Address",
+            r"[0-9A-Fa-f:.]*:[0-9A-Fa-f:.]*(?:%.+)?",
+        ),
+        _entry(Location.LAT_LONG, "lat_long", "LatLong", r"[^,]*\d[^,]*,[^,]*\d[^,]*"),
+        _entry(Computer.SEMVER, "sem_ver", "Semver", r"v\d.*"),
+        _entry(Computer.UUID, "uuid", "Uuid", r"[-{}:_+\w\s]{32,}"),
+        _entry(Location.TIME, "time.time", "Time", r"[-\w\s/:.]+"),
+        _entry(Game.CHESS, "chess", "Chess", r".*/.*"),
+    )
+}
 
 
 def str_to_index(s: str) -> int:
-    for cls in TypeNamer.SUBCLASSES.values():
-        try:
-            t = cls.str_to_type(s)
-        except Exception:
-            continue
-        n = cls.type_to_index(t)
-        r = cls.category.number_to_index(n)
-        assert isinstance(r, int)
-        return r
+    for _, index in _matches(s):
+        return index
 
     raise ValueError(f"Cannot understand string '{s}'")
 
 
+def all_matches(s: str) -> dict[str, int]:
+    """Return the index for every namer that understands `s`, in the order that
+    `str_to_index` tries them"""
+    return dict(_matches(s))
+
+
 def index_to_str(index: int) -> str:
-    category, n = make_category(index)
-    cls = TypeNamer.SUBCLASSES[category.name.lower()]
-    t = cls.index_to_type(n)
-    return cls.type_to_str(t)
+    category, n = stats.timed(make_category, "make_category")(index)
+    cls = get_namer(category)
+    t = stats.timed(cls.index_to_type, "index_to_type", cls)(n)
+    return stats.timed(cls.type_to_str, "type_to_str", cls)(t)
 
 
 def names() -> list[str]:
-    return list(TypeNamer.SUBCLASSES)
+    return list(REGISTRY) + [k for k in TypeNamer.SUBCLASSES if k not in REGISTRY]
+
+
+def get_namer(category: Any) -> type[TypeNamer[Any]]:
+    """Return the namer for a category, importing it if need be"""
+    name = category.name.lower()
+    if name not in TypeNamer.SUBCLASSES and name in REGISTRY:
+        importlib.import_module(f".{REGISTRY[name].module}", __name__)
+    return TypeNamer.SUBCLASSES[name]
+
+
+def namers(s: str | None = None) -> Iterator[type[TypeNamer[Any]]]:
+    """Yield each namer, registered ones first, importing them as needed.
+
+    If `s` is set, skip namers whose pattern shows they cannot parse it"""
+    for category, _, _, pattern in REGISTRY.values():
+        if s is None or pattern.fullmatch(s):
+            yield get_namer(category)
+
+    for k, v in list(TypeNamer.SUBCLASSES.items()):
+        if k not in REGISTRY and (s is None or not v.pattern or v.pattern.fullmatch(s)):
+            yield v
+
+
+def _matches(s: str) -> Iterator[tuple[str, int]]:
+    for cls in namers(s):
+        try:
+            t = stats.timed(cls.str_to_type, "str_to_type", cls)(s)
+        except Exception:
+            continue
+        n = stats.timed(cls.type_to_index, "type_to_index", cls)(t)
+        r = stats.timed(cls.category.number_to_index, "number_to_index")(n)
+        assert isinstance(r, int)
+        yield cls.category.name.lower(), r
+
+
+def __getattr__(name: str) -> type[TypeNamer[Any]]:
+    for e in REGISTRY.values():
+        if e.class_name == name:
+            return get_namer(e.category)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
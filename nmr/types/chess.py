@@ -1,6 +1,11 @@
+import bisect
+import itertools
+import math
+
 import chess
 
 from ..category import Game
+from ..pack_numbers import Packer
 from ..radixes import Radixes
 from ..type_namer import TypeNamer
 
@@ -14,76 +19,112 @@ class Chess(TypeNamer[chess.Board]):
 
     @staticmethod
     def type_to_index(b: chess.Board) -> int:
-        board, side, castle, ep, half_move, move = b.fen().split()
-        parts = (
-            int(move),
-            int(half_move),
-            en_passant_to_index(ep),
-            *(c in castle for c in CASTLES),
-            SIDES.index(side),
-            *(row_to_index(b) for b in board.split("/")),
+        castles = b.clean_castling_rights()
+        half_moves, half_move = divmod(b.halfmove_clock, HALF_MOVES)
+        full_moves, full_move = divmod(max(b.fullmove_number - 1, 0), FULL_MOVES)
+        return RADIXES.encode(
+            packer.pack(half_moves, full_moves),
+            board_to_index(b),
+            full_move,
+            half_move,
+            chess.square_file(b.ep_square) + 1 if b.has_legal_en_passant() else 0,
+            sum(1 << i for i, c in enumerate(CASTLES) if castles & c),
+            b.turn == chess.BLACK,
         )
-        ret = RADIXES.encode(*parts)
-        return ret
 
     @staticmethod
     def index_to_type(n: int) -> chess.Board:
-        parts = RADIXES.decode(n)
-        parts, board = parts[:-8], parts[-8:]
-        move, half_move, ep, *castle, side = parts
-        assert len(castle) == 4
-        fields = (
-            "/".join(index_to_row(r) for r in board),
-            SIDES[side],
-            "".join(c for b, c in zip(castle, CASTLES, strict=False) if b) or "-",
-            index_to_en_passant(ep),
-            str(half_move),
-            str(move),
-        )
-        return chess.Board(" ".join(fields))
-
-
-ALPHABET = "12345678BKNPQRbknpqr"
-SIDES = "wb"
-CASTLES = "KQkq"
-EP_LENGTH = 65
-ROW_RADIX = (1 + len(ALPHABET)) ** 8
-
-RADIXES = Radixes(51, EP_LENGTH, *(2 for c in CASTLES), len(SIDES), *(8 * [ROW_RADIX]))
-
-
-def en_passant_to_index(ep: str) -> int:
-    if ep == "-":
-        return 0
-
-    assert len(ep) == 2
-    col, row = ep[0], ep[1]
-    r = int(row) - 1
-    c = ord(col) - ord("a")
-    return 1 + 8 * r + c  # TODO: or the reverse?
-
-
-def index_to_en_passant(i: int) -> str:
-    if i == 0:
-        return "-"
-    r, c = divmod(i - 1, 8)
-    col = chr(ord("a") + c)
-    row = str(r + 1)
-    return f"{col}{row}"
-
-
-def row_to_index(row: str) -> int:
-    total = 0
-    for c in row:
-        total = total * (len(ALPHABET) + 1) + ALPHABET.index(c) + 1
-    return total
-
-
-def index_to_row(i: int) -> str:
-    row: list[str] = []
-    while i:
-        i, r = divmod(i, len(ALPHABET) + 1)
-        if not r:
-            break
-        row.append(ALPHABET[r - 1])
-    return "".join(reversed(row))
+        moves, board, full_move, half_move, ep, castles, side = RADIXES.decode(n)
+        half_moves, full_moves = packer.unpack(moves)
+
+        b = index_to_board(board)
+        b.turn = side == 0
+        b.castling_rights = sum(c for i, c in enumerate(CASTLES) if castles >> i & 1)
+        if ep:
+            b.ep_square = chess.square(ep - 1, 5 if b.turn else 2)
+        b.halfmove_clock = half_move + HALF_MOVES * half_moves
+        b.fullmove_number = 1 + full_move + FULL_MOVES * full_moves
+        return b
+
+
+# Each piece type in each colour
+PIECES = 2 * len(chess.PIECE_TYPES)
+
+# The order of the castling rights in FEN, KQkq
+CASTLES = chess.BB_H1, chess.BB_A1, chess.BB_H8, chess.BB_A8
+
+# No en passant square, or the file of one
+EN_PASSANTS = 1 + len(chess.FILE_NAMES)
+
+# Move counters at least this large spill into a number above the board
+HALF_MOVES = 128
+FULL_MOVES = 256
+
+# BOARD_OFFSETS[c] is the number of boards with fewer than c pieces, so boards
+# with few pieces have small indexes
+_BOARDS = (
+    math.comb(len(chess.SQUARES), c) * PIECES**c for c in range(len(chess.SQUARES) + 1)
+)
+BOARD_OFFSETS = tuple(itertools.accumulate(_BOARDS, initial=0))
+
+RADIXES = Radixes(
+    BOARD_OFFSETS[-1], FULL_MOVES, HALF_MOVES, EN_PASSANTS, 2 ** len(CASTLES), 2
+)
+packer = Packer(2)
+
+# COMBINATIONS[s][i] is math.comb(s, i)
+COMBINATIONS = tuple(
+    tuple(math.comb(s, i) for i in range(len(chess.SQUARES) + 1))
+    for s in range(len(chess.SQUARES) + 1)
+)
+
+
+def board_to_index(b: chess.BaseBoard) -> int:
+    """Number the pieces on a board.
+
+    The set of occupied squares is ranked among all sets of squares of the same
+    size, then each piece is a digit in base PIECES"""
+    occupied, white = b.occupied, b.occupied_co[chess.WHITE]
+    rank = pieces = 0
+    for i, square in enumerate(chess.scan_forward(occupied), 1):
+        rank += COMBINATIONS[square][i]
+
+    for square in chess.scan_reversed(occupied):
+        piece_type = b.piece_type_at(square)
+        assert piece_type
+        black = len(chess.PIECE_TYPES) * (not white >> square & 1)
+        pieces = PIECES * pieces + piece_type - 1 + black
+
+    count = occupied.bit_count()
+    return BOARD_OFFSETS[count] + rank * PIECES**count + pieces
+
+
+def index_to_board(n: int) -> chess.Board:
+    """The inverse of `board_to_index`"""
+    count = bisect.bisect_right(BOARD_OFFSETS, n) - 1
+    rank, pieces = divmod(n - BOARD_OFFSETS[count], PIECES**count)
+
+    squares = []
+    square = len(chess.SQUARES)
+    for i in range(count, 0, -1):
+        square -= 1
+        while COMBINATIONS[square][i] > rank:
+            square -= 1
+        rank -= COMBINATIONS[square][i]
+        squares.append(square)
+
+    # One bitboard for each piece type in each colour
+    masks = [chess.BB_EMPTY] * PIECES
+    for square in reversed(squares):
+        pieces, piece = divmod(pieces, PIECES)
+        masks[piece] |= chess.BB_SQUARES[square]
+
+    # The masks don't overlap, so their sums are their unions
+    b = chess.Board(None)
+    white, black = masks[: len(chess.PIECE_TYPES)], masks[len(chess.PIECE_TYPES) :]
+    by_type = [w | k for w, k in zip(white, black)]
+    b.pawns, b.knights, b.bishops, b.rooks, b.queens, b.kings = by_type
+    b.occupied_co[chess.WHITE] = sum(white)
+    b.occupied_co[chess.BLACK] = sum(black)
+    b.occupied = sum(by_type)
+    return b
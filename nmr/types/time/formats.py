@@ -1,11 +1,28 @@
+"""
+Parse times in any of the formats in PARSERS without calling strptime.
+
+Each format is compiled once into a skeleton, which is the format with every
+run of digits written as `9`, every run of letters as `a` and every run of
+whitespace as one space.  A string is split into tokens with one regular
+expression, its skeleton is looked up, and only the few formats with that
+skeleton are tried, with integer comparisons instead of exceptions.
+
+The results are the same as trying every format with `datetime.strptime`, in the
+C locale and for ASCII digits, except that two formats which give the same time,
+like `%b` and `%B` for "May", are not ambiguous.
+"""
+
 from __future__ import annotations
 
+import calendar
+import functools
 import itertools
+import re
+from collections.abc import Callable, Iterable, Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING
-from collections.abc import Iterable, Sequence
 
-from .constants import Interval
+from .constants import MICROSECOND_TO_YOCTOSECOND, SCALES, Interval
 
 if TYPE_CHECKING:
     from .time import Time
@@ -14,14 +31,23 @@ if TYPE_CHECKING:
 def from_string(s: str) -> Time:
     from .time import Time
 
-    def parse(p: str) -> datetime | None:
-        try:
-            return datetime.strptime(s, p)
-        except ValueError:
-            return None
+    if m := _ISO.fullmatch(s):
+        return _from_iso(m)
+
+    interval, dt = parse(s)
+    return Time.from_datetime(dt, interval)
+
+
+def parse(s: str) -> tuple[Interval, datetime]:
+    """Return the interval and time of the only format in PARSERS that `s` matches,
+    or raise a ValueError if none or more than one do"""
+    tokens = _TOKEN.findall(s.lower())
+    skeleton = "".join(_skeleton(t) for t in tokens)
+    times = []
+    for f in _formats().get(skeleton, ()):
+        if (dt := f.read(tokens)) and (t := (f.interval, dt)) not in times:
+            times.append(t)
 
-    all_parsers = ((i, p) for i, parsers in PARSERS.items() for p in parsers)
-    times = [Time(i, dt) for i, p in all_parsers if (dt := parse(p))]
     if not times:
         raise ValueError("No format matched")
     if len(times) > 1:
@@ -30,11 +56,25 @@ def from_string(s: str) -> Time:
 
 
 def to_string(t: Time) -> str:
-    return t.time.strftime(PARSERS[t.interval][0])
+    """Write the start of `t` in ISO 8601, to the precision of its interval,
+    followed by its duration if the precision doesn't show it"""
+    size, digits, duration = _ISO_FORMATS[t.interval]
+    year, *fields, yoctosecond = t.fields()
+
+    s = f"{year:04}" if year >= 0 else f"-{-year:04}"
+    s += "".join(f"{sep}{f:02}" for sep, f in zip("--T::", fields[: size - 1]))
+    if digits:
+        s += "." + f"{yoctosecond:024}"[:digits]
+    return s + duration
 
 
 def _product(*patterns: str, sep: str = " /") -> Iterable[str]:
-    yield from ("%" + f"{sep}%".join(c) for s, c in itertools.product(sep, patterns))
+    # With only one field, every separator gives the same format
+    formats = (
+        "%" + f"{s}%".join(c)
+        for s, c in itertools.product(sep, itertools.product(*patterns))
+    )
+    yield from dict.fromkeys(formats)
 
 
 PARSERS: dict[Interval, Sequence[str]] = {
@@ -58,3 +98,189 @@ PARSERS: dict[Interval, Sequence[str]] = {
     # Interval.DECADE: [_decade],
     # Interval.CENTURY: [_century],
 }
+
+# Time.__str__ writes one of these formats for each interval: the number of
+# fields, from year to second, the number of digits after the second, and the
+# duration.  Years need a duration so they aren't read as integers
+_ISO_FORMATS: dict[Interval, tuple[int, int, str]] = {
+    **{i: (6, 0, f"/PT{n}S") for i, n in SCALES[Interval.SECOND].items()},
+    **{i: (1, 0, f"/P{n}Y") for i, n in SCALES[Interval.YEAR].items()},
+    Interval.MONTH: (2, 0, ""),
+    Interval.WEEK: (3, 0, "/P1W"),
+    Interval.DAY: (3, 0, ""),
+    Interval.HOUR: (4, 0, ""),
+    Interval.MINUTE: (5, 0, ""),
+    Interval.SECOND: (6, 0, ""),
+    **{
+        i: (6, 25 - len(str(n * MICROSECOND_TO_YOCTOSECOND)), "")
+        for i, n in SCALES[Interval.MICROSECOND].items()
+    },
+    **{i: (6, 25 - len(str(n)), "") for i, n in SCALES[Interval.YOCTOSECOND].items()},
+}
+_ISO_PRECISIONS = {(n, d): i for i, (n, d, s) in _ISO_FORMATS.items() if not s}
+_ISO_DURATIONS = {s: i for i, (_, _, s) in _ISO_FORMATS.items() if s}
+
+# ISO 8601 dates and times in UTC, with an optional duration.  A space can be
+# used instead of T between the date and the time
+_ISO = re.compile(
+    r"(-?\d{4,})(?:-(\d\d)(?:-(\d\d)(?:[T ](\d\d)(?::(\d\d)(?::(\d\d)"
+    r"(?:\.(\d{1,24}))?)?)?)?)?)?Z?(/P\d+Y|/P1W|/PT\d+S)?"
+)
+
+
+def _from_iso(m: re.Match[str]) -> Time:
+    from .time import Time, civil_from_days, days_from_civil
+
+    *groups, fraction, duration = m.groups()
+    fields = [int(g) for g in groups if g is not None]
+    if duration:
+        if (interval := _ISO_DURATIONS.get(duration)) is None:
+            raise ValueError(f"Unknown duration {duration}")
+    elif (interval := _ISO_PRECISIONS.get((len(fields), len(fraction or "")))) is None:
+        raise ValueError("No interval has this precision")
+
+    year, month, day, hour, minute, second = fields + [1, 1, 0, 0, 0][len(fields) - 1 :]
+    if civil_from_days(days_from_civil(year, month, day)) != (year, month, day):
+        raise ValueError("Not a valid date")
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError("Not a valid time")
+
+    yoctosecond = int((fraction or "").ljust(24, "0"))
+    return Time.from_fields(
+        interval, year, month, day, hour, minute, second, yoctosecond
+    )
+
+
+_TOKEN = re.compile(r"[0-9]+|[a-z]+|\s+|.", re.DOTALL)
+_DIRECTIVE = re.compile(r"%(.)|([a-z]+)|(\s+)|(.)", re.DOTALL)
+
+_Read = Callable[[str], int | None]
+
+
+def _skeleton(token: str) -> str:
+    c = token[0]
+    if "0" <= c <= "9":
+        return "9"
+    if "a" <= c <= "z":
+        return "a"
+    return " " if c.isspace() else c
+
+
+def _number(low: int, high: int, *widths: int) -> _Read:
+    def read(token: str) -> int | None:
+        if len(token) in widths and low <= (i := int(token)) <= high:
+            return i
+        return None
+
+    return read
+
+
+def _names(names: Sequence[str]) -> _Read:
+    return {n.lower(): i for i, n in enumerate(names) if n}.get
+
+
+def _literal(text: str) -> _Read:
+    return {text: 0}.get
+
+
+# How strptime reads each directive, and which field of the time it sets
+_FIELDS: dict[str, tuple[str, _Read]] = {
+    "Y": ("year", _number(0, 9999, 4)),
+    "y": ("short_year", _number(0, 99, 2)),
+    "m": ("month", _number(1, 12, 1, 2)),
+    "b": ("month", _names(calendar.month_abbr)),
+    "B": ("month", _names(calendar.month_name)),
+    "d": ("day", _number(1, 31, 1, 2)),
+    "H": ("hour", _number(0, 23, 1, 2)),
+    "I": ("hour", _number(1, 12, 1, 2)),
+    "p": ("pm", _names(["am", "pm"])),
+    "M": ("minute", _number(0, 59, 1, 2)),
+    "S": ("second", _number(0, 61, 1, 2)),
+}
+_LETTERS = "bBp"
+
+# A step reads the token at an index into a field, or only checks it if the field
+# is empty
+_Step = tuple[int, str, _Read]
+
+
+class _Format:
+    def __init__(
+        self, interval: Interval, skeleton: str, steps: Sequence[_Step]
+    ) -> None:
+        self.interval = interval
+        self.skeleton = skeleton
+        self.steps = steps
+
+    def read(self, tokens: Sequence[str]) -> datetime | None:
+        """Return the time in `tokens`, or None if they don't fit this format"""
+        fields = {}
+        for i, field, read in self.steps:
+            if (value := read(tokens[i])) is None:
+                return None
+            if field:
+                fields[field] = value
+
+        if (year := fields.get("short_year")) is not None:
+            year += 2000 if year < 69 else 1900
+        else:
+            year = fields.get("year", 1900)
+
+        hour = fields.get("hour", 0)
+        if (pm := fields.get("pm")) is not None:
+            hour = hour % 12 + 12 * pm
+
+        try:
+            return datetime(
+                year,
+                fields.get("month", 1),
+                fields.get("day", 1),
+                hour,
+                fields.get("minute", 0),
+                fields.get("second", 0),
+            )
+        except ValueError:
+            return None
+
+
+@functools.cache
+def _formats() -> dict[str, list[_Format]]:
+    """Compile PARSERS into a table from each skeleton to the formats with it"""
+    table: dict[str, list[_Format]] = {}
+    for interval, formats in PARSERS.items():
+        for format in formats:
+            for f in _compile(interval, format):
+                table.setdefault(f.skeleton, []).append(f)
+    return table
+
+
+def _compile(interval: Interval, format: str) -> Iterable[_Format]:
+    """Yield a _Format for each skeleton that strptime would match with `format`"""
+    skeleton: list[str] = []
+    steps: list[_Step] = []
+    day = None
+
+    for directive, letters, space, other in _DIRECTIVE.findall(format):
+        if directive or letters:
+            kind = "a" if letters or directive in _LETTERS else "9"
+            if skeleton[-1:] == [kind]:
+                raise ValueError(f"Adjacent fields can't be split in {format=}")
+
+            if letters:
+                steps.append((len(skeleton), "", _literal(letters)))
+            else:
+                if directive == "d" and skeleton[-1:] != [" "]:
+                    day = len(skeleton)
+                steps.append((len(skeleton), *_FIELDS[directive]))
+            skeleton.append(kind)
+        else:
+            skeleton.append(" " if space else other)
+
+    yield _Format(interval, "".join(skeleton), steps)
+
+    if day is not None:
+        # strptime also reads a day as a single space and a digit
+        spaced = [(i + (i >= day), f, r) for i, f, r in steps if i != day]
+        spaced += [(day, "", _literal(" ")), (day + 1, "day", _number(1, 9, 1))]
+        skeleton.insert(day, " ")
+        yield _Format(interval, "".join(skeleton), spaced)
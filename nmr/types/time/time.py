@@ -3,121 +3,138 @@ from __future__ import annotations
 import dataclasses as dc
 from datetime import datetime
 
+from ...category import Location
 from ...type_namer import TypeNamer
+from ..integer import Integer
 from . import formats
-from .constants import INVERSE_SCALES, MICROSECOND_TO_YOCTOSECOND, SCALES, Interval
+from .constants import MICROSECOND_TO_YOCTOSECOND, SCALES, Interval
 
-YEAR_ZERO = datetime.fromtimestamp(0).year
-INTERVAL_SCALE = len(Interval)
+EPOCH_YEAR = 1970
+SECONDS_PER_DAY = 24 * 60 * 60
+YOCTOSECONDS_PER_SECOND = 10**24
 
+# Each interval is a whole number of one of these base units, which are all
+# counted from the start of EPOCH_YEAR in UTC
+BASES = {
+    interval: (base, scale)
+    for base, s in SCALES.items()
+    for interval, scale in s.items()
+}
 
-@dc.dataclass
+# How many of each base unit finer than a month there are in a second
+PER_SECOND = {
+    Interval.SECOND: 1,
+    Interval.MICROSECOND: YOCTOSECONDS_PER_SECOND // MICROSECOND_TO_YOCTOSECOND,
+    Interval.YOCTOSECOND: YOCTOSECONDS_PER_SECOND,
+}
+
+# The fields of a time, from year down to yoctosecond
+Fields = tuple[int, int, int, int, int, int, int]
+
+
+@dc.dataclass(frozen=True)
 class Time(TypeNamer["Time"]):
-    # A location in time
-    interval: Interval = dc.field(default=Interval.SECOND)
-    time: datetime = dc.field(default_factory=datetime.now)
+    """The `count`-th `interval` since the start of 1970 in UTC, where earlier
+    intervals have negative counts.  Every Interval is a whole number of
+    seconds, months or years, so all the arithmetic is exact."""
 
-    # datetime cannot represent all of time, so add optional offsets
-    yoctoseconds: int = 0
-    years: int = 0
+    interval: Interval = Interval.SECOND
+    count: int = 0
 
-    YEAR_ZERO = datetime.fromtimestamp(0).year
-    INTERVAL_SCALE = len(Interval)
+    category = Location.TIME
 
     __str__ = formats.to_string
-    str_to_type = staticmethod(from_string)
+    str_to_type = staticmethod(formats.from_string)
 
     @staticmethod
     def index_to_type(i: int) -> Time:
-        count, interval = divmod(i, INTERVAL_SCALE)
-        _base = INVERSE_SCALES[interval]
-        raise NotImplementedError
+        n, interval = divmod(i, len(Interval))
+        return Time(Interval(interval + 1), Integer.index_to_type(n))
 
     def __int__(self) -> int:
-        for base, scale in SCALES.items():
-            if div := scale.get(self.interval, 0):
-                break
-        else:
-            raise ValueError(f"Logic error: {self=}, {locals()=}")
-
-        if base == Interval.SECONDS:
-            count = self._whole_seconds()
-        elif base == Interval.MONTHS:
-            count = self._whole_months()
-        elif base == Interval.YEARS:
-            count = self._whole_years()
-        elif base == Interval.MICROSECONDS:
-            count = self._whole_microseconds()
-        elif base == Interval.YOCTOSECONDS:
-            count = self._whole_yoctoseconds()
-        else:
-            raise ValueError(f"Logic error: {self=}, {locals()=}")
-
-        return self.interval + self.INTERVAL_SCALE * count * div
-
-    def _whole_seconds(self) -> int:
-        # TODO: this is only approximate.
-        return int(self.time.timestamp()) + (self.years * 3562422) // 10000
-
-    def _whole_years(self) -> int:
-        return self.time.year - self.YEAR_ZERO + self.years
-
-    def _whole_microseconds(self) -> int:
-        return 10**6 * self._whole_seconds() + self.time.microsecond
-
-    def _whole_yoctoseconds(self) -> int:
-        yoctoseconds = self._whole_microseconds() * MICROSECOND_TO_YOCTOSECOND
-        return yoctoseconds + self.yoctoseconds
-
-    def _whole_months(self) -> int:
-        return 12 * self._whole_years() + self.time.month
-
-
-@dc.dataclass
-class Time(TypeNamer["Time"]):
-    # A location in time
-    interval: Interval = dc.field(default=Interval.SECOND)
-    time: datetime = dc.field(default_factory=datetime.now)
-
-    # datetime cannot represent all of time, so add optional offsets
-    yoctoseconds: int = 0
-    years: int = 0
-
-    def __str__(self) -> str:
-        raise NotImplementedError  # todo
+        return self.interval - 1 + len(Interval) * Integer.type_to_index(self.count)
 
     @staticmethod
-    def str_to_type(cls, s: str) -> Time: ...
-
-    @staticmethod
-    def index_to_type(cls, i: int) -> Time:
-        count, interval = divmod(i, INTERVAL_SCALE)
-        if interval == Interval.SECONDS:
-            count = int(self.time.timestamp()) + (self.years * 365_2422) // 10000
-        elif interval == Interval.MONTHS:
-            count = 12 * self._whole_years() + self.time.month
-        elif interval == Interval.YEARS:
-            count = self.time.year - YEAR_ZERO + self.years
-        elif interval == Interval.MICROSECONDS:
-            count = 10**6 * self._whole_seconds() + self.time.microsecond
-        elif interval == Interval.YOCTOSECONDS:
-            count = (
-                self.yoctoseconds
-                + self._whole_microseconds() * MICROSECOND_TO_YOCTOSECOND
-            )
+    def from_fields(
+        interval: Interval,
+        year: int,
+        month: int = 1,
+        day: int = 1,
+        hour: int = 0,
+        minute: int = 0,
+        second: int = 0,
+        yoctosecond: int = 0,
+    ) -> Time:
+        """Return the interval that contains a time, which must be valid in the
+        proleptic Gregorian calendar"""
+        base, scale = BASES[interval]
+        if base == Interval.YEAR:
+            n = year - EPOCH_YEAR
+        elif base == Interval.MONTH:
+            n = 12 * (year - EPOCH_YEAR) + month - 1
         else:
-            raise ValueError(f"Logic error: {locals()=}")
-        return Time(Interval(interval), time)
-
-    def _from_years(self) -> int:
-        return self.time.year - YEAR_ZERO + self.years
+            days = days_from_civil(year, month, day)
+            n = SECONDS_PER_DAY * days + 3600 * hour + 60 * minute + second
+            if (per_second := PER_SECOND[base]) != 1:
+                unit = YOCTOSECONDS_PER_SECOND // per_second
+                n = n * per_second + yoctosecond // unit
 
-    def _from_microseconds(self) -> int:
-        return 10**6 * self._from_seconds() + self.time.microsecond
+        return Time(interval, n // scale)
 
-    def _from_yoctoseconds(self) -> int:
-        yoctoseconds = self._from_microseconds() * MICROSECOND_TO_YOCTOSECOND
-        return yoctoseconds + self.yoctoseconds
-
-    def _from_months(self) -> int:
-        return 12 * self._from_years() + self.time.month
+    @staticmethod
+    def from_datetime(dt: datetime, interval: Interval = Interval.SECOND) -> Time:
+        """Return the interval that contains a datetime, which is in UTC if naive"""
+        if (offset := dt.utcoffset()) is not None:
+            dt = (dt - offset).replace(tzinfo=None)
+        return Time.from_fields(
+            interval,
+            *(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second),
+            dt.microsecond * MICROSECOND_TO_YOCTOSECOND,
+        )
+
+    def fields(self) -> Fields:
+        """Return the fields of the start of this interval"""
+        base, scale = BASES[self.interval]
+        n = self.count * scale
+        if base == Interval.YEAR:
+            return EPOCH_YEAR + n, 1, 1, 0, 0, 0, 0
+        if base == Interval.MONTH:
+            year, month = divmod(n, 12)
+            return EPOCH_YEAR + year, month + 1, 1, 0, 0, 0, 0
+
+        n, fraction = divmod(n, per_second := PER_SECOND[base])
+        days, seconds = divmod(n, SECONDS_PER_DAY)
+        hour, seconds = divmod(seconds, 3600)
+        minute, second = divmod(seconds, 60)
+        yoctosecond = fraction * (YOCTOSECONDS_PER_SECOND // per_second)
+        return *civil_from_days(days), hour, minute, second, yoctosecond
+
+    def to_datetime(self) -> datetime:
+        """Return the start of this interval as a naive datetime in UTC, or raise
+        a ValueError if datetime can't represent it"""
+        *fields, yoctosecond = self.fields()
+        return datetime(*fields, yoctosecond // MICROSECOND_TO_YOCTOSECOND)
+
+
+# Conversions between dates in the proleptic Gregorian calendar and days since
+# the epoch, from http://howardhinnant.github.io/date_algorithms.html
+def days_from_civil(year: int, month: int, day: int) -> int:
+    year -= month <= 2
+    era, year_of_era = divmod(year, 400)
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = 365 * year_of_era + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return 146097 * era + day_of_era - 719468
+
+
+def civil_from_days(days: int) -> tuple[int, int, int]:
+    era, day_of_era = divmod(days + 719468, 146097)
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (
+        365 * year_of_era + year_of_era // 4 - year_of_era // 100
+    )
+    m = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * m + 2) // 5 + 1
+    month = m + 3 if m < 10 else m - 9
+    return 400 * era + year_of_era + (month <= 2), month, day
@@ -0,0 +1,88 @@
+"""
+Encode and decode names of up to SLOTS words with straight-line code.
+
+With the 1628 words in words.txt, every number below 2**64 has a name of six
+words or fewer.  For each name length up to SLOTS, a function is generated that
+divides by each radix in turn, then dedupes the digits with a fixed sequence of
+comparisons, so there are no loops and every number stays small.  The results
+are identical to those of the general code in words.py.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Callable, Sequence
+from typing import Any
+
+SLOTS = 6
+
+
+class Uint64:
+    def __init__(self, words: Sequence[str], totals: Sequence[int]) -> None:
+        count = len(words)
+        self.length = min(SLOTS, count, len(totals) - 1)
+        self.totals = tuple(totals[: self.length + 1])
+        self.words = words
+
+        self._encoders: list[Callable[[int, Sequence[str]], list[str]]] = [_never]
+        self._decoders: list[Callable[[Sequence[int]], int]] = [_never]
+        for length in range(1, self.length + 1):
+            namespace: dict[str, Any] = {}
+            exec(_encoder(count, length), namespace)
+            exec(_decoder(count, length, self.totals[length - 1]), namespace)
+            self._encoders.append(namespace["encode"])
+            self._decoders.append(namespace["decode"])
+
+    def encode(self, num: int) -> list[str] | None:
+        """Return the name for `num`, or None if it is too long for this class"""
+        if (length := bisect.bisect_right(self.totals, num)) > self.length:
+            return None
+        return self._encoders[length](num - self.totals[length - 1], self.words)
+
+    def decode(self, indexes: Sequence[int]) -> int | None:
+        """Decode a name from the indexes of its words, or return None if it is
+        too long for this class"""
+        if not 0 < len(indexes) <= self.length:
+            return None
+        return self._decoders[len(indexes)](indexes)
+
+
+def _never(*_: Any) -> Any:
+    raise AssertionError
+
+
+def _encoder(count: int, length: int) -> str:
+    last = length - 1
+    lines = ["def encode(total, words):"]
+    for i in range(last):
+        lines.append(f"    total, d{i} = divmod(total, {count - i})")
+    lines.append(f"    d{last} = total")
+
+    # Each digit d{i} is the d{i}-th index not already used by the digits
+    # before it, which are kept sorted in s0, s1, ..., s{i - 1}
+    for i in range(length):
+        lines.extend(f"    if s{j} <= d{i}: d{i} += 1" for j in range(i))
+        if i < last:
+            lines.append(f"    s{i} = d{i}")
+            for j in reversed(range(i)):
+                lines.append(f"    if s{j + 1} < s{j}: s{j}, s{j + 1} = s{j + 1}, s{j}")
+
+    names = ", ".join(f"words[d{i}]" for i in reversed(range(length)))
+    lines.append(f"    return [{names}]")
+    return "\n".join(lines)
+
+
+def _decoder(count: int, length: int, offset: int) -> str:
+    indexes = ", ".join(f"e{i}" for i in reversed(range(length)))
+    lines = ["def decode(indexes):", f"    {indexes}, = indexes"]
+
+    # Each digit is its index, less the number of smaller indexes before it
+    terms = [str(offset)]
+    place = 1
+    for i in range(length):
+        smaller = "".join(f" - (e{j} < e{i})" for j in range(i))
+        terms.append(f"{place} * (e{i}{smaller})")
+        place *= count - i
+
+    lines.append(f"    return {' + '.join(terms)}")
+    return "\n".join(lines)
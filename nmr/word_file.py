@@ -0,0 +1,120 @@
+"""
+Read word lists from text files.
+
+If the environment variable NMR_CACHE_DIR is set, or a cache directory is passed
+in, the first time a word file is read it is cleaned, checked and compiled into a
+small binary artifact in that directory, which later reads load with a single
+read of the artifact and a stat of the text file.  Each artifact stores the size
+and modification time of the text file it was compiled from, so an artifact that
+is stale, corrupt or from a different version is rebuilt.
+
+Otherwise nothing is cached, so that reading a word file never writes anything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+MAGIC = b"NMRW"
+VERSION = 2
+SUFFIX = ".nmrw"
+
+# magic, version, ignore_case, size and mtime_ns of the text file, crc32 of the
+# payload
+_HEADER = struct.Struct("<4sH?QqI")
+
+# The size and mtime_ns of a text file
+Source = tuple[int, int]
+
+
+def read(
+    path: Path, ignore_case: bool = True, cache: Path | None = None
+) -> tuple[str, ...]:
+    """Return the cleaned words from a word file, using a compiled artifact in
+    `cache`, or else in NMR_CACHE_DIR, if either is set"""
+    if (cache := cache or cache_directory()) is None:
+        return clean(path.read_text().splitlines(), ignore_case)
+
+    st = path.stat()
+    source = st.st_size, st.st_mtime_ns
+    artifact = artifact_path(path, ignore_case, cache)
+
+    if (words := load(artifact, source, ignore_case)) is None:
+        words = clean(path.read_text().splitlines(), ignore_case)
+        try:
+            save(artifact, source, ignore_case, words)
+        except OSError:
+            pass
+
+    return words
+
+
+def clean(lines: Iterable[str], ignore_case: bool = True) -> tuple[str, ...]:
+    """Strip the lines, drop blanks and comments, and check for duplicates"""
+    it = (w.strip() for w in lines)
+    it = (w for w in it if w and not w.startswith("#"))
+    words = tuple(w.lower() for w in it) if ignore_case else tuple(it)
+
+    if bad := dupes(words):
+        s = "" if len(bad) == 1 else "s"
+        msg = ", ".join(sorted(bad))
+        raise ValueError(f"Duplicate word{s}: {msg}")
+
+    return words
+
+
+def dupes(words: Sequence[str]) -> list[str]:
+    return [k for k, v in Counter(words).items() if v > 1]
+
+
+def cache_directory() -> Path | None:
+    d = os.environ.get("NMR_CACHE_DIR")
+    return Path(d) if d else None
+
+
+def artifact_path(path: Path, ignore_case: bool, cache: Path) -> Path:
+    key = f"{path.resolve()}:{ignore_case}".encode()
+    name = f"{path.stem}-{hashlib.sha256(key).hexdigest()[:16]}{SUFFIX}"
+    return cache / name
+
+
+def load(artifact: Path, source: Source, ignore_case: bool) -> tuple[str, ...] | None:
+    """Return the words in an artifact, or None if it is missing or not current"""
+    try:
+        data = artifact.read_bytes()
+    except OSError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, version, case, size, mtime_ns, crc = _HEADER.unpack_from(data)
+    payload = memoryview(data)[_HEADER.size :]
+    if (magic, version, case) != (MAGIC, VERSION, ignore_case):
+        return None
+    if (size, mtime_ns) != source or zlib.crc32(payload) != crc:
+        return None
+
+    return tuple(str(payload, "utf-8").split("\n")) if payload else ()
+
+
+def save(
+    artifact: Path, source: Source, ignore_case: bool, words: Sequence[str]
+) -> None:
+    payload = "\n".join(words).encode()
+    crc = zlib.crc32(payload)
+    header = _HEADER.pack(MAGIC, VERSION, ignore_case, *source, crc)
+
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    tmp = artifact.with_name(f"{artifact.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(header + payload)
+        os.replace(tmp, artifact)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,93 @@
+"""
+Recognize names, either as a whole string or inside longer text.
+
+Checking whether a string is a name and finding the indexes of its words happen
+in one pass over the string, using the word dictionary, which is already a
+perfect hash.  Names in free text are found with a single regular expression
+built from a trie of the words, so that words with a common prefix share their
+matching work.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, AnyStr
+
+
+class WordIndex:
+    def __init__(self, inverse: Mapping[str, int], ignore_case: bool = True) -> None:
+        self.inverse = inverse
+        self.ignore_case = ignore_case
+        self._patterns: dict[tuple[Any, int], re.Pattern[Any]] = {}
+
+    def indexes(self, s: str | Iterable[str]) -> list[int] | None:
+        """Return the index of each word in `s` if `s` is a name, or else None.
+
+        `s` is either a string of words separated by whitespace, or the words"""
+        if isinstance(s, str):
+            words: Iterable[str] = (s.lower() if self.ignore_case else s).split()
+        elif self.ignore_case:
+            words = (w.lower() for w in s)
+        else:
+            words = s
+
+        get = self.inverse.get
+        result = [get(w) for w in words]
+        if not result or None in result or len(set(result)) < len(result):
+            return None
+        return result  # type: ignore[return-value]
+
+    def pattern(self, separator: AnyStr, min_words: int = 1) -> re.Pattern[AnyStr]:
+        """Return a regular expression that matches at least `min_words` words
+        joined by `separator`, a literal str or bytes.
+
+        A match might repeat a word, and so not be a name: see `finditer`"""
+        key = separator, min_words
+        if (p := self._patterns.get(key)) is None:
+            word = _trie_regex(self.inverse)
+            binary = isinstance(separator, bytes)
+            sep = re.escape(separator.decode() if binary else separator)
+            repeat = f"{{{min_words - 1},}}"
+            # Words must not be part of some longer word
+            s = rf"(?<!\w)(?:{word})(?:{sep}(?:{word})){repeat}(?!\w)"
+
+            flags = re.IGNORECASE if self.ignore_case else 0
+            p = re.compile(s.encode() if binary else s, flags)
+            self._patterns[key] = p
+        return p
+
+    def finditer(
+        self, text: str, separator: str = " ", min_words: int = 1
+    ) -> Iterator[tuple[re.Match[str], list[int]]]:
+        """Yield each name in `text` whose words are joined by `separator`, with
+        the indexes of its words"""
+        for m in self.pattern(separator, min_words).finditer(text):
+            s = m.group().replace(separator, " ")
+            if (indexes := self.indexes(s)) is not None:
+                yield m, indexes
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Return a regular expression that matches exactly the given words, built
+    from a trie so common prefixes are only matched once"""
+    trie: dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for c in w:
+            node = node.setdefault(c, {})
+        node[""] = {}
+
+    def to_regex(node: dict[str, Any]) -> str:
+        ends = "" in node
+        parts = [re.escape(c) + to_regex(n) for c, n in sorted(node.items()) if c]
+        if not parts:
+            return ""
+
+        if len(parts) == 1 and not (ends and len(parts[0]) > 1):
+            s = parts[0]
+        else:
+            s = "(?:" + "|".join(parts) + ")"
+        return s + "?" if ends else s
+
+    return to_regex(trie)
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
 import bisect
-from collections import Counter
 from collections.abc import Iterator, Sequence
+from functools import cached_property
 from pathlib import Path
 from typing import cast
 from collections.abc import Iterable
 
-from . import count_words
+from . import batch, count_words, radixes, word_file
+from .fenwick import Fenwick
+from .uint64 import SLOTS, Uint64
+from .word_index import WordIndex
 
 # The minimum total number of words needed to be able to represent all 64-bit
 # integers with six words or less is 1628
 FILE = Path(__file__).parent.parent / "words.txt"
 COUNT_FOR_FILE = 1628
 
+# Names up to this length are faster to dedupe with a simple quadratic scan
+SMALL_NAME = 128
+
 
 class Words:
     """A list of words to use in naming."""
@@ -36,13 +42,9 @@ class Words:
                 count = COUNT_FOR_FILE
 
         if isinstance(words, Path):
-            with words.open() as fp:
-                words = tuple(fp)
-
-        it = (w.strip() for w in words)
-        it = (w for w in it if w and not w.startswith("#"))
-        words = tuple(self._maybe_lower(it))
-        _check_dupes(words)
+            words = word_file.read(words, ignore_case)
+        else:
+            words = word_file.clean(words, ignore_case)
 
         if count is None:
             count = len(words)
@@ -54,7 +56,7 @@ class Words:
         self.words = words
         self.count = count
         self._count_words = count_words.CountWords(self.count)
-        self.inverse = {w: i for i, w in enumerate(self.words)}
+        self.inverse = dict(zip(self.words, range(count)))
 
     def count_words(self, n: int | None = None) -> int:
         return self._count_words.count(n)
@@ -68,71 +70,100 @@ class Words:
         ):
             s = "s" if "," in bad else ""
             raise ValueError(f"Didn't recognize the following word{s}: {bad}")
-        return self._from_digits(list(_redupe(cast(list[int], inverses)))[::-1])
+        return self._from_indexes(cast(list[int], inverses[::-1]))
+
+    def decode_many(self, names: Iterable[Sequence[str]]) -> list[int]:
+        return batch.decode_many(self, names)
+
+    def encode_many(self, nums: Iterable[int]) -> list[Sequence[str]]:
+        return batch.encode_many(self, nums)
 
     def encode_to_name(self, num: int) -> Sequence[str]:
         if num < 0:
             raise ValueError("Only accepts non-negative numbers")
+        if (name := self._uint64.encode(num)) is not None:
+            return name
         return [self.words[i] for i in self._to_digits(num)]
 
     def is_name(self, s: Sequence[str]) -> bool:
-        s = list(self._maybe_lower(s))
-        return all(i in self.inverse for i in s) and not _dupes(s)
+        return self.word_index.indexes(s) is not None
+
+    @cached_property
+    def word_index(self) -> WordIndex:
+        return WordIndex(self.inverse, self.ignore_case)
 
     def _to_digits(self, num: int) -> list[int]:
-        it = (i + 1 for i in range(self.count) if self.count_words(i + 1) > num)
-        if (word_count := next(it, None)) is None:
+        if (word_count := self._count_words.word_count(num)) is None:
             raise ValueError(f"Cannot represent {num} in base {self.count}")
 
         total = num - self.count_words(word_count - 1)
-        digits = []
+        if word_count > radixes.SMALL_RADIXES:
+            digits = radixes.split(total, self._radixes(word_count))
+        else:
+            digits = []
 
-        for i in range(word_count):
-            total, index = divmod(total, self.count - i)
-            digits.append(index)
-        assert not total
+            for i in range(word_count):
+                total, index = divmod(total, self.count - i)
+                digits.append(index)
+            assert not total
 
         return list(_undupe(digits))[::-1]
 
     def _from_digits(self, digits: list[int]) -> int:
-        total = 0
-        for i, d in enumerate(digits):
-            total *= self.count - (len(digits) - i - 1)
-            total += d
+        if len(digits) > radixes.SMALL_RADIXES:
+            total = radixes.join(digits[::-1], self._radixes(len(digits)))
+        else:
+            total = 0
+            for i, d in enumerate(digits):
+                total *= self.count - (len(digits) - i - 1)
+                total += d
 
         return self.count_words(len(digits) - 1) + total
 
-    def _maybe_lower(self, it: Iterable[str]) -> Iterable[str]:
-        yield from (i.lower() for i in it) if self.ignore_case else it
-
-
-def _check_dupes(words: Sequence[str]) -> None:
-    if e := _dupe_error(words):
-        raise ValueError(e)
+    def _from_indexes(self, indexes: Sequence[int]) -> int:
+        """Decode a name from the indexes of its words"""
+        if (num := self._uint64.decode(indexes)) is not None:
+            return num
+        return self._from_digits(list(_redupe(indexes[::-1]))[::-1])
 
+    @cached_property
+    def _uint64(self) -> Uint64:
+        """Straight-line code for short names, which most numbers below 2**64 have"""
+        self.count_words(SLOTS)
+        return Uint64(self.words, self._count_words.totals)
 
-def _dupe_error(words: Sequence[str]) -> str | None:
-    if bad := _dupes(words):
-        s = "" if len(bad) == 1 else "s"
-        msg = ", ".join(sorted(bad))
-        return f"Duplicate word{s}: {msg}"
-    return None
+    def _radixes(self, word_count: int) -> range:
+        return range(self.count, self.count - word_count, -1)
 
-
-def _dupes(words: Sequence[str]) -> list[str]:
-    return [k for k, v in Counter(words).items() if v > 1]
+    def _maybe_lower(self, it: Iterable[str]) -> Iterable[str]:
+        yield from (i.lower() for i in it) if self.ignore_case else it
 
 
 def _redupe(indexes: Sequence[int]) -> Iterator[int]:
-    for i, num in enumerate(indexes):
-        yield num - sum(k < num for k in indexes[:i])
+    if len(indexes) <= SMALL_NAME:
+        for i, num in enumerate(indexes):
+            yield num - sum(k < num for k in indexes[:i])
+        return
+
+    tree = Fenwick(max(indexes) + 1)
+    for num in indexes:
+        yield num - tree.used_below(num)
+        tree.add(num)
 
 
 def _undupe(indexes: Sequence[int]) -> Iterator[int]:
-    sorted_result: list[int] = []
+    if len(indexes) <= SMALL_NAME:
+        sorted_result: list[int] = []
+
+        for i in indexes:
+            for s in sorted_result:
+                i += s <= i
+            bisect.insort(sorted_result, i)
+            yield i
+        return
 
+    tree = Fenwick(max(i + j for j, i in enumerate(indexes)) + 1)
     for i in indexes:
-        for s in sorted_result:
-            i += s <= i
-        bisect.insort(sorted_result, i)
+        i = tree.unused(i)
+        tree.add(i)
         yield i
@@ -0,0 +1,236 @@
+"""
+Time the paths that encode and decode, and compare them against a baseline.
+
+    python scripts/benchmark.py [--output FILE] [--baseline FILE] [-k PATTERN]
+
+Results are written as JSON, with the median and minimum seconds per call for each
+benchmark.  A benchmark whose minimum is more than `--threshold` slower than in
+the baseline is reported as a regression, and the script then exits with status 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+from collections.abc import Callable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from import_time import import_time
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from nmr import Nmr, types  # noqa: E402
+from nmr.count_words import CountWords  # noqa: E402
+from nmr.pack_numbers import BalancedPacker, Packer  # noqa: E402
+from nmr.radixes import Radixes  # noqa: E402
+from nmr.types import chess  # noqa: E402
+
+FORMAT = 1
+
+# Lengths of names, in words
+NAME_LENGTHS = 1, 4, 16, 128, 1024
+
+# Sizes of each packed number, in bits
+PACK_BITS = 8, 64, 1024
+
+# A string that each namer understands
+SAMPLES = {
+    "fraction": "-1752/491",
+    "integer": "12341324",
+    "ip_v4_address": "127.0.0.1",
+    "ip_v6_address": "2001:0:130f::9c0:876a:130b",
+    "lat_long": """52° 22' 3.36" N, 4° 54' 14.76" E""",
+    "semver": "v1.1.92",
+    "uuid": "123e4567-e89b-12d3-a456-426614174000",
+    "time": "2024-05-01T12:30:05",
+    "chess": "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+}
+
+PIPE_LINES = 2000
+
+# The number of numbers in each batch
+BATCH_SIZE = 1000
+
+Benchmark = tuple[str, Callable[[], Any]]
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    nmr = Nmr()
+
+    for length in NAME_LENGTHS:
+        num = nmr.count_words(length) - 1
+        name = nmr.encode_to_name(num)
+        yield f"words.encode_to_name[{length}]", partial(nmr.encode_to_name, num)
+        yield f"words.decode_from_name[{length}]", partial(nmr.decode_from_name, name)
+
+    for length in NAME_LENGTHS:
+        yield f"count_words.count[{length}]", partial(_count, nmr.count, length)
+
+    for packer in Packer(2), Packer(3), Packer(3, False), BalancedPacker(3):
+        label = f"{type(packer).__name__}({packer.count})"
+        if isinstance(packer, Packer) and not packer.forward:
+            label = label.replace(")", ", False)")
+
+        for bits in PACK_BITS:
+            numbers = [2**bits - 1 - i for i in range(packer.count)]
+            packed = packer.pack(*numbers)
+            yield f"{label}.pack[{bits}]", partial(packer.pack, *numbers)
+            yield f"{label}.unpack[{bits}]", partial(packer.unpack, packed)
+
+    radixes = chess.RADIXES
+    digits = radixes.decode(radixes.places[0] * 12345 - 1)
+    yield "Radixes.encode[chess]", partial(radixes.encode, *digits)
+    yield "Radixes.decode[chess]", partial(radixes.decode, radixes.encode(*digits))
+
+    small = Radixes(2, 2, 23, 19, 2)
+    nums = list(range(0, 2**40, 2**40 // BATCH_SIZE))
+    yield (
+        f"Radixes.encode_many[{BATCH_SIZE}]",
+        partial(small.encode_many, small.decode_many(nums)),
+    )
+    yield f"Radixes.decode_many[{BATCH_SIZE}]", partial(small.decode_many, nums)
+
+    for namer, s in SAMPLES.items():
+        index = types.all_matches(s)[namer]
+        # The integer namer is shadowed by the fraction namer in str_to_index
+        if types.str_to_index(s) == index:
+            yield f"types.str_to_index[{namer}]", partial(types.str_to_index, s)
+        yield f"types.index_to_str[{namer}]", partial(types.index_to_str, index)
+
+    for namer, s in SAMPLES.items():
+        name = " ".join(nmr.str_to_name(s))
+        yield f"nmr.convert[{namer}]", partial(nmr.convert, s)
+        yield f"nmr.convert[{namer} name]", partial(nmr.convert, name)
+
+    lines = "\n".join(SAMPLES[k] for k in sorted(SAMPLES) if k != "chess")
+    pipe_input = "\n".join([lines] * (PIPE_LINES // len(SAMPLES)))
+    yield f"cli.pipe[{PIPE_LINES}]", partial(_pipe, pipe_input)
+
+    yield "import", lambda: import_time()["nmr"] / 1_000_000
+
+
+def run(
+    pattern: str = "", repeat: int = 5, min_time: float = 0.2
+) -> dict[str, dict[str, Any]]:
+    results = {}
+    for name, function in benchmarks():
+        if pattern and not re.search(pattern, name):
+            continue
+
+        if name == "import":
+            # import_time returns its own measurement
+            times = [function() for _ in range(repeat)]
+            number = 1
+        else:
+            timer = timeit.Timer(function)
+            number = _autorange(timer, min_time)
+            times = [t / number for t in timer.repeat(repeat, number)]
+
+        results[name] = {
+            "median": statistics.median(times),
+            "min": min(times),
+            "number": number,
+            "repeat": repeat,
+        }
+        print(f"{name:42} {_format(results[name]['median'])}", file=sys.stderr)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Print a comparison with the baseline and return the names of regressions"""
+    regressions = []
+    for name, r in results.items():
+        if (b := baseline.get(name)) is None:
+            print(f"{name:42} {_format(r['min'])}       (new)")
+            continue
+
+        # The minimum is the least noisy measure of how fast code can run
+        ratio = r["min"] / b["min"]
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        mark = "  REGRESSION" if regressed else ""
+        print(f"{name:42} {_format(r['min'])} {ratio:6.2f}x{mark}")
+
+    for name in sorted(set(baseline) - set(results)):
+        print(f"{name:42} (missing)")
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", "-o", type=Path, help="Write results here")
+    parser.add_argument("--baseline", "-b", type=Path, help="Compare with this file")
+    parser.add_argument("--threshold", "-t", type=float, default=0.2)
+    parser.add_argument("-k", dest="pattern", default="", help="Run matching names")
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.repeat, args.min_time)
+    if args.output:
+        doc = {
+            "format": FORMAT,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(doc, indent=2, sort_keys=True) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("format") != FORMAT:
+            sys.exit(f"{args.baseline}: unknown format {baseline.get('format')}")
+        previous = {
+            k: v for k, v in baseline["results"].items() if re.search(args.pattern, k)
+        }
+        if regressions := compare(results, previous, args.threshold):
+            sys.exit(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+
+
+def _autorange(timer: timeit.Timer, min_time: float) -> int:
+    number = 1
+    while (t := timer.timeit(number)) < min_time and number < 1_000_000:
+        number *= 10 if t < min_time / 10 else 2
+    return number
+
+
+def _count(n: int, length: int) -> int:
+    return CountWords(n).count(length)
+
+
+def _pipe(text: str) -> None:
+    cmd = sys.executable, "-m", "nmr"
+    subprocess.run(
+        cmd, cwd=ROOT, input=text, capture_output=True, text=True, check=True
+    )
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in ("s", 1), ("ms", 1e3), ("µs", 1e6):
+        if seconds * scale >= 1:
+            break
+    else:
+        unit, scale = "ns", 1e9
+    return f"{seconds * scale:8.2f}{unit:2}"
+
+
+if __name__ == "__main__":
+    main()
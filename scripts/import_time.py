@@ -0,0 +1,55 @@
+"""
+Measure how long `import nmr` takes in a fresh interpreter, using
+`python -X importtime`.
+
+    python scripts/import_time.py [--repeat N] [module ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def import_time(module: str = "nmr") -> dict[str, int]:
+    """Return the cumulative import time in microseconds of every module
+    imported by `import module` in a new interpreter"""
+    cmd = sys.executable, "-X", "importtime", "-c", f"import {module}"
+    p = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in p.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isnumeric():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=["nmr"])
+    parser.add_argument("--repeat", "-r", type=int, default=10)
+    parser.add_argument("--top", "-t", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        totals = [r[module] for r in runs]
+        print(
+            f"{module}: median {statistics.median(totals) / 1000:.2f}ms,",
+            f"min {min(totals) / 1000:.2f}ms over {len(totals)} runs",
+        )
+
+        slowest = sorted(runs[-1].items(), key=lambda i: -i[1])[1 : args.top + 1]
+        for name, t in slowest:
+            print(f"    {t / 1000:8.2f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from nmr import Nmr, batch, nmr
+
+RNG = random.Random(0)
+NUMBERS = (
+    list(range(100))
+    + [2**64 - 1, 2**64 - 2, 2**63, 2**32, 1628, 1628 * 1627 + 1628]
+    + [RNG.randrange(2**64) for _ in range(500)]
+    + [RNG.randrange(2 ** RNG.randrange(64)) for _ in range(500)]
+)
+
+
+@pytest.fixture(params=(True, False), ids=("numpy", "python"))
+def use_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(batch, "_numpy", lambda: None)
+
+
+def test_encode_many(use_numpy):
+    names = nmr.encode_many(NUMBERS)
+    assert names == [nmr.encode_to_name(n) for n in NUMBERS]
+    assert nmr.decode_many(names) == NUMBERS
+
+
+def test_encode_many_big(use_numpy):
+    numbers = [0, 2**64, 3**100]
+    names = nmr.encode_many(numbers)
+    assert names == [nmr.encode_to_name(n) for n in numbers]
+    assert nmr.decode_many(names) == numbers
+
+
+@pytest.mark.parametrize("count", (2, 3, 5))
+def test_small_word_lists(count, use_numpy):
+    n = Nmr(count=count)
+    numbers = list(range(n.count_words()))
+    assert n.encode_many(numbers) == [n.encode_to_name(i) for i in numbers]
+    assert n.decode_many(n.encode_many(numbers)) == numbers
+
+
+def test_decode_many_odd_names(use_numpy):
+    names = [["THE", "Of"], ["of", "of"], ["the"] * 7, ["and"] * 3]
+    assert nmr.decode_many(names) == [nmr.decode_from_name(n) for n in names]
+
+
+def test_errors(use_numpy):
+    with pytest.raises(ValueError, match="Only accepts non-negative numbers"):
+        nmr.encode_many([1, -1])
+
+    with pytest.raises(ValueError, match="Didn't recognize the following word: zzz"):
+        nmr.decode_many([["the"], ["zzz"]])
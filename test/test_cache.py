@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from nmr import Nmr
+from nmr.cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    calls = []
+
+    def get(key):
+        return cache.get(key, lambda: calls.append(key) or key.upper())
+
+    assert [get(k) for k in "abab"] == ["A", "B", "A", "B"]
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 2, 0)
+
+    assert get("c") == "C"  # Evicts a, the least recently used
+    assert get("b") == "B"
+    assert get("a") == "A"  # Evicts c
+    assert calls == ["a", "b", "c", "a"]
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (3, 4, 2, 2)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (0, 0, 0, 0)
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_threads():
+    cache = LRUCache(50)
+    keys = [i % 100 for i in range(4000)]
+
+    def run():
+        for k in keys:
+            assert cache.get(k, lambda k=k: -k) == -k
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.hits + cache.misses == 4 * len(keys)
+    assert len(cache) == 50
+    # Threads that miss on the same key at once both compute it
+    assert cache.misses - cache.evictions >= 50
+
+
+def test_nmr_cache():
+    nmr = Nmr(cache_size=100)
+    assert Nmr().cache is None
+
+    for _ in range(3):
+        assert nmr.convert("12") == "that lucky"
+        assert nmr.convert("that lucky") == "12"
+    assert (nmr.cache.hits, nmr.cache.misses) == (4, 2)
+
+    name = nmr.encode_to_name(2718281828)
+    name.append("changed")
+    assert nmr.encode_to_name(2718281828) == ["owen", "lord", "rich"]
+    assert nmr.decode_from_name(iter(["owen", "lord", "rich"])) == 2718281828
+    assert nmr.decode_from_name(["owen", "lord", "rich"]) == 2718281828
+    assert (nmr.cache.hits, nmr.cache.misses) == (6, 4)
+
+    with pytest.raises(ValueError):
+        nmr.convert("zzz")
+    with pytest.raises(ValueError):
+        nmr.convert("zzz")
+    assert nmr.cache.misses == 6
@@ -1,10 +1,11 @@
+import random
+
 import pytest
-from chess import Board
+from chess import BLACK, PIECE_TYPES, WHITE, Board, Piece
 
 from nmr import nmr
 from nmr.types import chess
 
-INDICES = 0, 1, 2, 17, 225289, 82394423423
 COUNT = 10
 
 
@@ -20,11 +21,42 @@ def _end(a):
     return a[-1]
 
 
-@pytest.mark.parametrize("index", INDICES)
-def test_rows(index):
-    r = chess.index_to_row(index)
-    actual = chess.row_to_index(r)
-    assert actual == index, r
+def _random_board(rng, count):
+    b = Board(None)
+    for square in rng.sample(range(64), count):
+        b.set_piece_at(
+            square, Piece(rng.choice(PIECE_TYPES), rng.choice((WHITE, BLACK)))
+        )
+    return b
+
+
+@pytest.mark.parametrize("count", (0, 1, 2, 17, 32, 63, 64))
+def test_boards(count):
+    rng = random.Random(count)
+    for _ in range(COUNT):
+        b = _random_board(rng, count)
+        index = chess.board_to_index(b)
+        assert chess.BOARD_OFFSETS[count] <= index < chess.BOARD_OFFSETS[count + 1]
+        assert chess.index_to_board(index).board_fen() == b.board_fen()
+
+
+def test_board_indexes():
+    for index in range(2000):
+        assert chess.board_to_index(chess.index_to_board(index)) == index
+
+    assert chess.BOARD_OFFSETS[-1] == 13**64
+
+
+def test_move_counters():
+    b = Board()
+    b.halfmove_clock, b.fullmove_number = 300, 1000
+    index = chess.Chess.type_to_index(b)
+    assert chess.Chess.index_to_type(index).fen() == b.fen()
+    assert index > chess.RADIXES.encode(1, *(6 * [0]))
+
+
+def test_short_names():
+    assert len(nmr.str_to_name(Board().fen())) == 20
 
 
 def test_basic():
@@ -0,0 +1,115 @@
+import subprocess
+import sys
+
+import pytest
+from chess import Board
+
+from nmr import nmr
+from nmr._main import Main
+from nmr.chess_games import GameNamer, split_games
+
+PGN = """\
+[Event "One"]
+[Site "?"]
+
+1. e4 e5 2. Nf3 (2. f4 exf4) Nc6 {a comment
+[over two lines]} 3. Bb5 a6 1-0
+
+[Event "Two"]
+[FEN "8/8/8/4k3/8/8/4P3/4K3 w - - 0 40"]
+[SetUp "1"]
+
+40. e4+ Kxe4 1/2-1/2
+
+[Event "Illegal"]
+
+1. e4 e4 *
+"""
+
+LINES = PGN.splitlines(keepends=True)
+
+EPD = """\
+rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - id "start";
+
+8/8/8/4k3/8/8/4P3/4K3 w - - hmvc 3; fmvn 40;
+"""
+
+
+def _fens(*moves, fen=Board.starting_fen):
+    board = Board(fen)
+    fens = [board.fen()]
+    for m in moves:
+        board.push_san(m)
+        fens.append(board.fen())
+    return fens
+
+
+GAMES = [
+    _fens("e4", "e5", "Nf3", "Nc6", "Bb5", "a6"),
+    _fens("e4", "Kxe4", fen="8/8/8/4k3/8/8/4P3/4K3 w - - 0 40"),
+]
+
+
+def _fens_of(results):
+    assert all(ok for ok, _ in results)
+    games = "".join(v for _, v in results).split("\n\n")
+    return [[nmr.name_to_str(n.split()) for n in g.splitlines()] for g in games if g]
+
+
+def test_split_games():
+    games = list(split_games(LINES))
+    assert [g.splitlines()[0] for g in games] == [
+        '[Event "One"]',
+        '[Event "Two"]',
+        '[Event "Illegal"]',
+    ]
+    assert "".join(games) == PGN
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_games(jobs, monkeypatch):
+    monkeypatch.setattr("nmr.chess_games.CHUNK_SIZE", 1)
+    *results, (ok, error) = GameNamer(nmr, jobs=jobs).name(split_games(LINES))
+    assert _fens_of(results) == GAMES
+    assert not ok and "illegal san" in str(error)
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_final(jobs):
+    results = list(GameNamer(nmr, final=True, jobs=jobs).name(split_games(LINES)))
+    assert _fens_of(results[:2]) == [[GAMES[0][-1], GAMES[1][-1]]]
+    assert not results[2][0]
+
+
+def test_epd():
+    results = list(GameNamer(nmr).name(EPD.splitlines(), epd=True))
+    fens = Board().fen(), "8/8/8/4k3/8/8/4P3/4K3 w - - 3 40"
+    assert _fens_of(results) == [list(fens)]
+
+
+def test_main_games(tmp_path, capsys):
+    (pgn := tmp_path / "games.pgn").write_text(PGN)
+    (epd := tmp_path / "positions.epd").write_text(EPD)
+    main = Main(arguments=[str(pgn), str(epd)], games=True, final=True)
+    main()
+    out, err = capsys.readouterr()
+
+    assert len(out.splitlines()) == 4
+    assert err.startswith("ERROR: illegal san")
+    assert main.returncode == 1
+
+    with pytest.raises(ValueError, match="--final only works with --games"):
+        Main(arguments=["12"], final=True)()
+
+
+def test_main_games_round_trip(tmp_path, capsys):
+    (pgn := tmp_path / "games.pgn").write_text(PGN)
+    Main(arguments=[str(pgn)], games=True)()
+    name = capsys.readouterr().out.splitlines()[0]
+
+    # Like `nmr --games games.pgn | nmr`, in a new process so that nothing has
+    # imported nmr.types.chess yet
+    cmd = sys.executable, "-m", "nmr"
+    p = subprocess.run(cmd, input=name, capture_output=True, text=True)
+    assert p.returncode == 0, p.stderr
+    assert Board.starting_fen in p.stdout
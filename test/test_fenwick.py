@@ -0,0 +1,21 @@
+import random
+
+import pytest
+
+from nmr.fenwick import Fenwick
+
+SIZES = 1, 2, 7, 64, 1000
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_fenwick(size):
+    rng = random.Random(size)
+    tree = Fenwick(size)
+    used: set[int] = set()
+
+    for i in rng.sample(range(size), size):
+        unused = sorted(set(range(size)) - used)
+        assert [tree.unused(j) for j in range(len(unused))] == unused
+        assert tree.used_below(i) == sum(u < i for u in used)
+        tree.add(i)
+        used.add(i)
@@ -1,5 +1,10 @@
 import io
 import random
+import subprocess
+import sys
+import threading
+from subprocess import PIPE
+from unittest.mock import patch
 
 import pytest
 
@@ -18,6 +23,114 @@ def run_main(*arguments):
     main()
 
 
+PIPE_INPUT = "12\n\n# comment\n127.0.0.1\nzzz\nthat lucky\n1/2  # half\n"
+
+
+def run_pipe(text, **kwargs):
+    main = Main(**kwargs)
+    main.is_pipe = True
+    stdin = io.TextIOWrapper(io.BytesIO(text.encode()))
+    with patch("sys.stdin", stdin):
+        main()
+    return main
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_pipe(jobs, capsys, monkeypatch):
+    monkeypatch.setattr("nmr._main.CHUNK_SIZE", 2)
+    main = run_pipe(PIPE_INPUT * 3, jobs=jobs)
+    out, err = capsys.readouterr()
+
+    lines = ["that lucky", "item lazy giant van", "12", "tax"]
+    assert out.splitlines() == 3 * lines
+    assert err.splitlines() == 3 * ["ERROR: Cannot understand string 'zzz'"]
+    assert main.returncode == 1
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_pipe_stats(jobs, capsys, monkeypatch):
+    monkeypatch.setattr("nmr.stats.STATS", None)
+    monkeypatch.setattr("nmr._main.CHUNK_SIZE", 2)
+    run_pipe(PIPE_INPUT, jobs=jobs, stats=True)
+    out, err = capsys.readouterr()
+
+    assert out.splitlines() == ["that lucky", "item lazy giant van", "12", "tax"]
+    rows = {line.split()[0]: line.split()[1] for line in err.splitlines()[2:]}
+    assert rows["convert"] == rows["is_name"] == "5"
+    assert rows["str_to_index"] == "4"
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_pipe_raise(jobs, capsys):
+    with pytest.raises(ValueError, match="Cannot understand string"):
+        run_pipe(PIPE_INPUT, jobs=jobs, raise_exceptions=True)
+    assert capsys.readouterr().out.splitlines() == ["that lucky", "item lazy giant van"]
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_pipe_separator_and_errors(jobs, capsys, monkeypatch):
+    monkeypatch.setattr("nmr._main.BLOCK_SIZE", 3)
+    monkeypatch.setattr("nmr._main.BUFFER_SIZE", 5)
+    text = PIPE_INPUT.replace("\n", "\0") + "caf\u00e9"
+    main = run_pipe(text, jobs=jobs, separator="\\0", errors="inline")
+    out, err = capsys.readouterr()
+
+    expected = [
+        "that lucky",
+        "item lazy giant van",
+        "ERROR: Cannot understand string 'zzz'",
+        "12",
+        "tax",
+        "ERROR: Cannot understand string 'caf\u00e9'",
+        "",
+    ]
+    assert out.split("\0") == expected
+    assert not err
+    assert main.returncode == 1
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_pipe_streams(jobs):
+    # Like `tail -f log | nmr`: each line is written out before the input ends
+    cmd = sys.executable, "-m", "nmr", "--jobs", str(jobs)
+    with subprocess.Popen(cmd, stdin=PIPE, stdout=PIPE, text=True) as p:
+        timer = threading.Timer(60, p.kill)
+        timer.start()
+        try:
+            for line, expected in ("12\n", "that lucky\n"), ("1/2\n", "tax\n"):
+                p.stdin.write(line)
+                p.stdin.flush()
+                assert p.stdout.readline() == expected
+            p.stdin.close()
+            assert p.wait() == 0
+        finally:
+            timer.cancel()
+
+
+def test_pipe_separators(capsys):
+    run_pipe("12\u203d1/2", separator="\u203d")
+    assert capsys.readouterr().out == "that lucky\u203dtax\u203d"
+
+    run_pipe("12\u00e9\t12", separator="\u00e9\\t")
+    assert capsys.readouterr().out == "that lucky\u00e9\tthat lucky\u00e9\t"
+
+    with pytest.raises(ValueError, match="--separator can't be empty"):
+        run_pipe("12", separator="")
+    with pytest.raises(ValueError, match="Can't read --separator"):
+        run_pipe("12", separator="\\")
+
+
+def test_pipe_ignore_errors(capsys):
+    main = run_pipe(PIPE_INPUT, errors="ignore")
+    out, err = capsys.readouterr()
+    assert out.splitlines() == ["that lucky", "item lazy giant van", "12", "tax"]
+    assert not err
+    assert main.returncode == 1
+
+    with pytest.raises(ValueError, match="--errors must be one of"):
+        run_pipe(PIPE_INPUT, errors="wrong")
+
+
 def DISABLED_test_number_to_name(stdout_no_stdin):
     run_main("14", "2342")
     assert stdout_no_stdin().out == "it\nthe ear\n"
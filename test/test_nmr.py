@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from nmr import nmr
@@ -55,3 +57,36 @@ def test_stability(number, words):
     actual_words = nmr.encode_to_name(number)
     assert actual_words == words
     assert nmr.decode_from_name(words) == number
+
+
+@pytest.mark.parametrize("n", (1, 2, 3, 5))
+def test_word_count(n):
+    cw = CountWords(n)
+    totals = [cw.count(i) for i in range(n + 1)]
+
+    for num in range(totals[-1] + 1):
+        expected = next((i for i, t in enumerate(totals) if t > num), None)
+        assert cw.word_count(num) == expected
+
+
+def test_count_words_shared():
+    a = CountWords(1000, precompute=10)
+    assert len(a.totals) >= 11
+    assert a.totals == tuple(sorted(a.totals))
+
+    b = CountWords(1000, precompute=0)
+    before = b.totals
+    assert b.count(100) == a.count(100)
+    assert a.totals is b.totals
+    assert before == b.totals[: len(before)]
+
+    with_threads = []
+    threads = [
+        threading.Thread(target=lambda i=i: with_threads.append(b.count(100 * i)))
+        for i in range(1, 11)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(with_threads) == [a.count(100 * i) for i in range(1, 11)]
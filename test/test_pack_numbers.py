@@ -2,7 +2,7 @@ import itertools
 
 import pytest
 
-from nmr.pack_numbers import Packer
+from nmr.pack_numbers import BalancedPacker, Packer
 
 ROUND_TRIPS = (
     [0],
@@ -22,3 +22,36 @@ def test_round_trip(numbers, forward):
     p = Packer(len(numbers), forward)
     result = p.unpack(p.pack(*numbers))
     assert result == numbers
+
+
+@pytest.mark.parametrize("forward", [False, True])
+def test_big_round_trip(forward):
+    numbers = [3**500, 0, 2**1000 + 1, 10**300]
+    p = Packer(len(numbers), forward)
+    assert p.unpack(p.pack(*numbers)) == numbers
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4])
+def test_balanced_order(count):
+    tuples = itertools.product(range(6), repeat=count)
+    expected = sorted((t for t in tuples if sum(t) < 6), key=lambda t: (sum(t), t))
+
+    p = BalancedPacker(count)
+    assert [tuple(p.unpack(i)) for i in range(len(expected))] == expected
+    assert [p.pack(*t) for t in expected] == list(range(len(expected)))
+
+
+def test_balanced_big_round_trip():
+    numbers = [3**500, 0, 2**1000 + 1, 10**300]
+    p = BalancedPacker(len(numbers))
+    assert p.unpack(p.pack(*numbers)) == numbers
+
+
+def test_balanced_errors():
+    p = BalancedPacker(2)
+    with pytest.raises(ValueError):
+        p.pack(1, 2, 3)
+    with pytest.raises(ValueError):
+        p.pack(1, -2)
+    with pytest.raises(ValueError):
+        p.unpack(-1)
@@ -1,6 +1,10 @@
+import math
+import random
+
 import pytest
 
-from nmr.radixes import Radixes
+from nmr.radixes import Radixes, _product, join, split
+from nmr.types import chess
 
 RADIXES = Radixes(2, 2, 23, 19, 2)
 NUMBERS = 0, 1, 2, 100, 1028, 1001239212
@@ -11,3 +15,66 @@ def test_radixes(number):
     parts = RADIXES.decode(number)
     number2 = RADIXES.encode(*parts)
     assert number == number2
+
+
+@pytest.mark.parametrize("length", (1, 5, 64, 65, 300))
+def test_split_join(length):
+    rng = random.Random(length)
+    radixes = [rng.randrange(2, 1000) for _ in range(length)]
+    n = rng.randrange(math.prod(radixes))
+
+    digits = split(n, radixes)
+    assert all(0 <= d < r for d, r in zip(digits, radixes))
+    assert join(digits, radixes) == n
+
+    with pytest.raises(ValueError):
+        split(math.prod(radixes), radixes)
+
+
+def test_product():
+    for radixes in range(5, 0, -1), range(5, -1, -1), range(7, 2, -1), [3, 5, 7]:
+        assert _product(radixes) == math.prod(radixes)
+
+
+@pytest.mark.parametrize("count", (0, 1, 6, 14, 64, 65))
+def test_radixes_code(count):
+    rng = random.Random(count)
+    radixes = Radixes(
+        *(rng.randrange(2, 2 ** rng.randrange(2, 70)) for _ in range(count))
+    )
+    assert radixes.places[0] == math.prod(radixes.radixes)
+    for _ in range(100):
+        digits = [rng.randrange(1000)] + [rng.randrange(r) for r in radixes.radixes]
+        expected = 0
+        for d, r in zip(digits, (1, *radixes.radixes)):
+            expected = expected * r + d
+        assert radixes.encode(*digits) == expected
+        assert radixes.decode(expected) == digits
+
+
+def test_long_radixes():
+    radixes = Radixes(*[7] * 3000)
+    assert radixes.places[0] == 7**3000
+    digits = [5] + [i % 7 for i in range(3000)]
+    n = radixes.encode(*digits)
+    assert radixes.decode(n) == digits
+    assert radixes.decode_many([n, 12]) == [digits, radixes.decode(12)]
+
+
+def test_many():
+    nums = [*range(1000), 2**64 - 1, 2**63 + 12345]
+    rows = RADIXES.decode_many(nums)
+    assert rows == [RADIXES.decode(n) for n in nums]
+    assert all(type(d) is int for row in rows for d in row)
+    assert RADIXES.encode_many(rows) == nums
+
+    big = [2**64, 2**100 + 7]
+    assert RADIXES.decode_many(big) == [RADIXES.decode(n) for n in big]
+    assert RADIXES.decode_many([]) == RADIXES.encode_many([]) == []
+
+
+def test_many_big_radixes():
+    nums = [5, 10, 2**64 - 1, 3**200]
+    rows = chess.RADIXES.decode_many(nums)
+    assert rows == [chess.RADIXES.decode(n) for n in nums]
+    assert chess.RADIXES.encode_many(rows) == nums
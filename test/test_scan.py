@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+from nmr import nmr
+from nmr._main import Main
+from nmr.scan import Scanner
+
+TEXT = b"""\
+2024-01-15 12:30:45 GET 123e4567-e89b-12d3-a456-426614174000 from 10.0.0.1 in 5ms
+user 98765432 from 2001:db8::1, port 8080.
+unchanged: 010.0.0.1 123E4567-E89B-12D3-A456-426614174000 3.14159 std::vector 7
+"""
+
+EXPECTED = b"""\
+2024-01-15 12:30:45 GET ~be-peas-type-born-class-model-gate-jazz-wall-fair-joint-\
+actor-ray from ~that-worse-when-bill in 5ms
+user ~she-moved-album-dust-doll-want from ~can-table-boom-think-wood-tray-kent-\
+moved-clip-grade-pub-pad-junk, port ~the-dutch-tony-mode.
+unchanged: 010.0.0.1 123E4567-E89B-12D3-A456-426614174000 3.14159 std::vector \
+~and-men
+"""
+
+
+def scan(data, **kwargs):
+    out = io.BytesIO()
+    count = Scanner(nmr, **kwargs).scan(data, out)
+    return count, out.getvalue()
+
+
+def test_scan():
+    assert scan(TEXT) == (6, EXPECTED)
+    assert scan(EXPECTED, reverse=True) == (6, TEXT)
+
+
+@pytest.mark.parametrize("s", ("98765432", "7", "10.0.0.1", "2001:db8::1"))
+def test_scan_like_convert(s):
+    name = "~" + nmr.convert(s).replace(" ", "-")
+    assert scan(s.encode())[1] == name.encode()
+    assert scan(name.encode(), reverse=True)[1] == s.encode()
+
+
+def test_scan_kinds():
+    count, out = scan(TEXT, kinds=["ip_v4_address"])
+    assert count == 1
+    assert out == TEXT.replace(b" 10.0.0.1", b" ~that-worse-when-bill")
+
+    with pytest.raises(ValueError, match="Cannot scan for time"):
+        Scanner(nmr, kinds=["time"])
+
+
+def test_reverse_ignores_other_names():
+    text = b"~a-hairy-base is a fraction, ~The-Peas is capitalized, ~of-of repeats\n"
+    assert scan(text, reverse=True) == (0, text)
+
+
+def test_reverse_ignores_prose():
+    # Each of these hyphenated words would be read as a name without a marker
+    text = b"a type-name, head-one and up-park, at-use-tax\n"
+    assert scan(text, reverse=True) == (0, text)
+
+    # type-name is the Integer 1680, but convert names 1680 as a Fraction
+    assert scan(text.replace(b"type", b"~type"), reverse=True)[0] == 0
+    assert scan(text.replace(b"type-name", b"~that-lucky"), reverse=True)[0] == 1
+
+
+def test_markers():
+    text = b"~ ~~ ~type-name ~123456 x~~~10.0.0.1\n"
+    count, out = scan(text)
+    assert count == 2
+    assert out.startswith(b"~~ ~~~~ ~~type-name ~~~walk-dirty-bone-even x~~~~~~~that")
+    assert scan(out, reverse=True) == (2, text)
+
+    with pytest.raises(ValueError, match="Bad marker"):
+        Scanner(nmr, marker="-")
+
+
+def test_scan_file(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    out = io.BytesIO()
+    assert Scanner(nmr).scan_file(path, out) == 6
+    assert out.getvalue() == EXPECTED
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    out = io.BytesIO()
+    assert Scanner(nmr).scan_file(empty, out) == 0
+    assert out.getvalue() == b""
+
+
+def test_main_scan(tmp_path, capsysbinary):
+    path = tmp_path / "log.txt"
+    path.write_bytes(TEXT)
+    main = Main(arguments=[str(path), str(path)], scan=True)
+    main.is_pipe = True
+    main()
+    assert capsysbinary.readouterr().out == 2 * EXPECTED
+
+    with pytest.raises(ValueError, match="--reverse only works with --scan"):
+        Main(arguments=["12"], reverse=True)()
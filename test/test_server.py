@@ -0,0 +1,50 @@
+import asyncio
+
+from nmr import nmr
+from nmr.server import Server
+
+REQUESTS = (
+    ("convert 12", "OK that lucky"),
+    ("convert that lucky", "OK 12"),
+    ("encode 2718281828", "OK owen lord rich"),
+    ("decode owen  LORD rich", "OK 2718281828"),
+    ("convert zzz", "ERROR Cannot understand string 'zzz'"),
+    ("encode -1", "ERROR Only accepts non-negative numbers"),
+    ("decode of zzz", "ERROR Didn't recognize the following word: zzz"),
+    ("frob 12", "ERROR Unknown command 'frob'"),
+)
+
+
+def run(requests, **kwargs):
+    async def session():
+        server = await Server(nmr, **kwargs).start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            # All the requests are sent before any response is read
+            writer.write("".join(r + "\n" for r in requests).encode())
+            writer.write_eof()
+            data = await reader.read()
+            writer.close()
+            await writer.wait_closed()
+        return data.decode().splitlines()
+
+    return asyncio.run(session())
+
+
+def test_server():
+    requests, responses = zip(*REQUESTS)
+    assert run(requests) == list(responses)
+
+
+def test_heavy_and_backpressure():
+    name = " ".join(nmr.encode_to_name(3**2000))
+    requests = [f"decode {name}", "convert 12"] * 50
+    expected = [f"OK {3**2000}", "OK that lucky"] * 50
+    assert run(requests, heavy_size=100, max_pending=3) == expected
+
+
+def test_response():
+    server = Server(nmr)
+    for request, response in REQUESTS:
+        assert server.response(request) == response
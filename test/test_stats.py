@@ -0,0 +1,56 @@
+import pytest
+
+from nmr import Nmr, stats
+
+
+@pytest.fixture
+def st(monkeypatch):
+    monkeypatch.setattr(stats, "STATS", None)
+    return stats.enable()
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(stats, "STATS", None)
+    assert Nmr().convert("12") == "that lucky"
+    assert stats.STATS is None
+
+
+def test_convert(st):
+    nmr = Nmr()
+    assert nmr.convert("12") == "that lucky"
+    assert nmr.convert("127.0.0.1") == "item lazy giant van"
+    assert nmr.convert("that lucky") == "12"
+
+    counts = st.counts
+    assert counts["convert"] == counts["is_name"] == 3
+    assert counts["str_to_index"] == counts["encode_to_name"] == 2
+    assert counts["Fraction.str_to_type"] == counts["IPv4Address.str_to_type"] == 1
+    assert counts["decode_from_name"] == counts["make_category"] == 1
+    assert counts["Fraction.index_to_type"] == counts["Fraction.type_to_str"] == 1
+    assert all(s >= 0 for s in st.seconds.values())
+
+    assert stats.disable() is st
+    assert stats.STATS is None
+
+
+def test_merge_and_report(st):
+    st.add("a", 0.5)
+    st.add("b", 0.25, 2)
+
+    other = stats.Stats()
+    other.merge(st.as_dict())
+    other.merge(st.as_dict())
+    assert other.as_dict() == {
+        "a": {"count": 2, "seconds": 1.0},
+        "b": {"count": 4, "seconds": 0.5},
+    }
+
+    lines = other.report().splitlines()
+    assert lines[0].split() == ["stage", "calls", "total", "ms", "mean", "µs"]
+    assert [i.split() for i in lines[1:]] == [
+        ["a", "2", "1000.000", "500000.00"],
+        ["b", "4", "500.000", "125000.00"],
+    ]
+
+    other.clear()
+    assert other.as_dict() == {}
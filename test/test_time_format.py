@@ -1,9 +1,158 @@
+import calendar
+import random
+import re
+from datetime import date, datetime, timedelta, timezone
+
 import pytest
 
-ROUND_TRIPS = ()
+from nmr import types
+
+from nmr.types.time.constants import Interval
+from nmr.types.time.formats import PARSERS, _compile, parse
+from nmr.types.time.time import Time, civil_from_days, days_from_civil
+
+ROUND_TRIPS = (
+    "1970-01-01T00:00:00",
+    "2024-05-01T12:30:05",
+    "2024-05-01T12:30",
+    "2024-05-01T12",
+    "2024-05-01",
+    "2024-05",
+    "2024/P1Y",
+    "2020/P10Y",
+    "-0044-03-15",
+    "12345-12-31T23:59:59",
+    "2024-05-02/P1W",
+    "2009-02-13T23:16:40/PT1000S",
+    "2024-05-01T12:30:05.123",
+    "2024-05-01T12:30:05.123456",
+    "1969-12-31T23:59:59.999999999999999999999999",
+)
 
 
 @pytest.mark.parametrize("s", ROUND_TRIPS)
 def test_index_roundtrips(s):
     i = types.str_to_index(s)
     assert s == types.index_to_str(i)
+
+
+def _strptime(s):
+    times = []
+    for interval, formats in PARSERS.items():
+        for f in formats:
+            try:
+                t = interval, datetime.strptime(s, f)
+            except ValueError:
+                continue
+            if t not in times:
+                times.append(t)
+    return times
+
+
+def _samples():
+    rng = random.Random(23)
+    samples = {
+        *("", "x", "12", "5", "2020", "20", "May", "may 2020", "MAY 5", "1 / 2"),
+        *("31/02/2020", "29 feb", "29/2/2000", "12:60", "24:00", "12:30:61"),
+        *("0h", "12H30", "13pm", "12am", "12:30:05 PM", "1/ 5", " 5/1", "1\t2"),
+    }
+    for _ in range(5):
+        dt = datetime(*(rng.randrange(*r) for r in ((1900, 2100), (1, 13), (1, 29))))
+        dt = dt.replace(hour=rng.randrange(24), minute=rng.randrange(60))
+        for formats in PARSERS.values():
+            for f in formats:
+                s = dt.strftime(f)
+                samples |= {s, s.upper(), s.replace(" ", "  "), s + " "}
+                samples |= {re.sub(r"\b0(\d)", r"\1", s), re.sub(r"\b0(\d)", r" \1", s)}
+    return sorted(samples)
+
+
+def test_parse_like_strptime():
+    for s in _samples():
+        expected = _strptime(s)
+        if len(expected) == 1:
+            assert [parse(s)] == expected, s
+        else:
+            with pytest.raises(ValueError):
+                parse(s)
+
+
+def test_parse():
+    assert parse("12:30:05PM") == (Interval.SECOND, datetime(1900, 1, 1, 12, 30, 5))
+    assert parse("12h30") == (Interval.MINUTE, datetime(1900, 1, 1, 12, 30))
+    assert parse("5 May 2020") == (Interval.DAY, datetime(2020, 5, 5))
+    assert parse("may 68") == (Interval.MONTH, datetime(2068, 5, 1))
+    assert parse("1969") == (Interval.YEAR, datetime(1969, 1, 1))
+
+    with pytest.raises(ValueError, match="No format matched"):
+        parse("31/02/2020")
+    with pytest.raises(ValueError, match="Multiple formats matched"):
+        parse("5/6")
+
+
+def test_products():
+    assert "%d/%B/%y" in PARSERS[Interval.DAY]
+    assert "%Y %m" in PARSERS[Interval.MONTH]
+    assert len(set(PARSERS[Interval.YEAR])) == len(PARSERS[Interval.YEAR]) == 2
+
+
+def test_adjacent_fields():
+    with pytest.raises(ValueError, match="Adjacent fields"):
+        list(_compile(Interval.MINUTE, "%H%M"))
+
+
+@pytest.mark.parametrize("interval", Interval)
+def test_intervals(interval):
+    for count in 0, 1, -1, 1234567, -98765, 10**30:
+        t = Time(interval, count)
+        assert Time.index_to_type(int(t)) == t
+        assert Time.str_to_type(str(t)) == t
+
+
+def test_indexes():
+    times = [Time.index_to_type(i) for i in range(3 * len(Interval))]
+    assert [int(t) for t in times] == list(range(3 * len(Interval)))
+    assert times[0] == Time(Interval.SECOND, 0)
+    assert times[len(Interval)] == Time(Interval.SECOND, 1)
+    assert times[2 * len(Interval) + 1] == Time(Interval.MINUTE, -1)
+
+
+def test_from_datetime():
+    rng = random.Random(0)
+    for _ in range(1000):
+        timestamp = rng.randrange(-(10**10), 10**10)
+        dt = datetime(1970, 1, 1) + timedelta(seconds=timestamp, microseconds=17)
+        assert Time.from_datetime(dt) == Time(Interval.SECOND, timestamp)
+        micro = Time.from_datetime(dt, Interval.MICROSECOND)
+        assert micro == Time(Interval.MICROSECOND, 10**6 * timestamp + 17)
+        assert micro.to_datetime() == dt
+        assert Time.from_datetime(dt, Interval.DAY).count == timestamp // 86400
+
+    dt = datetime(2024, 5, 1, 14, 30, 5, tzinfo=timezone(timedelta(hours=2)))
+    assert Time.from_datetime(dt) == Time(
+        Interval.SECOND, calendar.timegm(dt.utctimetuple())
+    )
+    assert str(Time.from_datetime(dt, Interval.MONTH)) == "2024-05"
+
+
+def test_civil():
+    epoch = date(1970, 1, 1).toordinal()
+    for days in range(date(1, 1, 1).toordinal() - epoch, 800000, 997):
+        d = date.fromordinal(days + epoch)
+        assert days_from_civil(d.year, d.month, d.day) == days
+        assert civil_from_days(days) == (d.year, d.month, d.day)
+
+    assert civil_from_days(days_from_civil(-4713, 11, 24)) == (-4713, 11, 24)
+
+
+def test_time_strings():
+    assert Time.str_to_type("2024-05-01 12:30:05Z") == Time.str_to_type(
+        "2024-05-01T12:30:05"
+    )
+    assert str(Time.str_to_type("2024-05-01T12:30:05/P1W")) == "2024-04-25/P1W"
+    assert str(Time.str_to_type("5 May 2020")) == "2020-05-05"
+    assert str(Time.str_to_type("12:30:05PM")) == "1900-01-01T12:30:05"
+
+    for s in "2024-02-30", "2024-05-01T24:00", "2024-05-01T12:30:05.1234", "2024/P3Y":
+        with pytest.raises(ValueError):
+            Time.str_to_type(s)
@@ -1,6 +1,15 @@
+import fractions
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from nmr import nmr, types
+from nmr.type_namer import TypeNamer
+from nmr.types import chess  # noqa: F401
+
+ROOT = Path(__file__).parent.parent
 
 ROUND_TRIPS = (
     "12341324",
@@ -13,6 +22,7 @@ ROUND_TRIPS = (
     "1/2",
     "-1752/491",
     "2001:0:130f::9c0:876a:130b",
+    "2024-05-01T12:30:05",
 )
 
 
@@ -58,3 +68,86 @@ def test_fractions():
 
     actual = [str(types.Fraction.index_to_type(i)) for i in expected2]
     assert actual == expected1
+
+
+def test_semver_indexes():
+    # Existing names of versions must keep decoding to the same versions
+    versions = "v0.0.0", "v1.0.0", "v0.1.0", "v10.4.12"
+    indexes = [
+        types.Semver.type_to_index(types.Semver.str_to_type(v)) for v in versions
+    ]
+    assert indexes == [0, 1, 2, 12709]
+
+
+def test_lazy_import():
+    code = (
+        "import sys, nmr; nmr.nmr.encode_to_name(12); nmr.types.index_to_str(0); "
+        "print(*sorted(m for m in sys.modules if m.startswith('nmr.types.')))"
+    )
+    cmd = sys.executable, "-c", code
+    p = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
+    assert p.stdout.split() == ["nmr.types.integer"]
+
+
+def test_names():
+    assert types.names()[:3] == ["fraction", "integer", "ip_v4_address"]
+    assert types.Fraction.category.name == "FRACTION"
+    with pytest.raises(AttributeError):
+        types.Unknown
+
+
+TRICKY = (
+    *ROUND_TRIPS,
+    " 12 ",
+    "+1_000",
+    "١٢",
+    ".5e-3",
+    "1.5, 2",
+    "N 23.43, W 45.21",
+    "1.2.3",
+    "::1",
+    "fe80::1%eth0",
+    "::ffff:1.2.3.4",
+    "{123E4567-E89B-12D3-A456-426614174000}",
+    "urn:uuid:123e4567-e89b-12d3-a456-426614174000",
+    "0x123e4567e89b12d3a456426614174000",
+    "v1.2.3-rc.1+build",
+    "v1",
+    "hello",
+    "",
+    "1/0",
+    "1 / 2",
+    "1/ 2",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+)
+
+
+def _brute_force(s):
+    result = {}
+    for name in types.names():
+        cls = TypeNamer.SUBCLASSES[name]
+        try:
+            t = cls.str_to_type(s)
+        except Exception:
+            continue
+        result[name] = cls.category.number_to_index(cls.type_to_index(t))
+    return result
+
+
+@pytest.mark.parametrize("s", TRICKY)
+def test_all_matches(s):
+    list(types.namers())
+    expected = _brute_force(s)
+    actual = types.all_matches(s)
+    assert actual == expected
+    if expected:
+        assert types.str_to_index(s) == next(iter(expected.values()))
+    else:
+        with pytest.raises(ValueError, match="Cannot understand"):
+            types.str_to_index(s)
+
+
+def test_big_fraction():
+    f = fractions.Fraction(-(3**200), 2**300 + 1)
+    index = types.Fraction.type_to_index(f)
+    assert types.Fraction.index_to_type(index) == f
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from nmr import nmr
+from nmr.batch import UINT64_MAX
+from nmr.words import Words, _redupe
+
+SMALL = Words([f"w{i}" for i in range(7)])
+NUMBERS = [0, 1, 1627, 1628, 2**32, UINT64_MAX - 1, UINT64_MAX]
+
+
+def general_encode(words, num):
+    return [words.words[i] for i in words._to_digits(num)]
+
+
+def general_decode(words, indexes):
+    return words._from_digits(list(_redupe(indexes[::-1]))[::-1])
+
+
+@pytest.mark.parametrize("words", [nmr, SMALL])
+def test_same_as_general(words):
+    r = random.Random(0)
+    top = words.count_words(words._uint64.length)
+    nums = [n % top for n in NUMBERS] + [r.randrange(top) for _ in range(2000)]
+    for i in range(1, words._uint64.length):
+        nums += [words.count_words(i) - 1, words.count_words(i)]
+
+    for num in nums:
+        name = words.encode_to_name(num)
+        assert name == general_encode(words, num)
+
+        indexes = [words.inverse[w] for w in name]
+        assert words._uint64.decode(indexes) == num == general_decode(words, indexes)
+
+
+def test_too_long():
+    assert nmr._uint64.length == 6
+    assert nmr.count_words(6) > UINT64_MAX
+
+    num = nmr.count_words(6)
+    assert nmr._uint64.encode(num) is None
+    assert nmr._uint64.decode(list(range(7))) is None
+    assert nmr._uint64.decode([]) is None
+
+    name = nmr.encode_to_name(num)
+    assert len(name) == 7
+    assert nmr.decode_from_name(name) == num
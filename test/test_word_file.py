@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from nmr import Nmr, word_file
+from nmr.words import FILE
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("NMR_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def test_compiled(cache):
+    expected = word_file.clean(FILE.read_text().splitlines())
+    assert not cache.exists()
+
+    assert word_file.read(FILE) == expected
+    (artifact,) = cache.iterdir()
+    assert artifact.suffix == word_file.SUFFIX
+
+    assert word_file.read(FILE) == expected
+    assert word_file.read(FILE, ignore_case=False) == expected
+    assert len(list(cache.iterdir())) == 2
+
+
+def test_stale(cache, tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("# comment\nOne\n\n two\nthree\n")
+    assert word_file.read(path) == ("one", "two", "three")
+
+    path.write_text("four\nfive\n")
+    assert word_file.read(path) == ("four", "five")
+
+    (artifact,) = cache.iterdir()
+    data = bytearray(artifact.read_bytes())
+    data[-1] ^= 1
+    artifact.write_bytes(data)
+    assert word_file.read(path) == ("four", "five")
+    assert artifact.read_bytes() != data
+
+
+def test_dupes(cache, tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("one\ntwo\nOne\n")
+    with pytest.raises(ValueError, match="Duplicate word: one"):
+        word_file.read(path)
+    assert not cache.exists()
+
+
+def test_unwritable(monkeypatch, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("NMR_CACHE_DIR", str(blocker / "cache"))
+    assert Nmr(FILE, 10).words == Nmr().words[:10]
+
+
+def test_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("NMR_CACHE_DIR", raising=False)
+    env = dict(os.environ, HOME=str(tmp_path), XDG_CACHE_HOME=str(tmp_path))
+    cmd = sys.executable, "-c", "import nmr; nmr.nmr.encode_to_name(12)"
+    subprocess.run(cmd, check=True, cwd=ROOT, env=env)
+    assert not list(tmp_path.iterdir())
+
+    cache = tmp_path / "cache"
+    assert word_file.read(FILE, cache=cache) == word_file.read(FILE)
+    assert len(list(cache.iterdir())) == 1
+
+
+def test_save_fails(cache, monkeypatch):
+    def replace(*_):
+        raise OSError
+
+    monkeypatch.setattr("os.replace", replace)
+    assert word_file.read(FILE) == word_file.clean(FILE.read_text().splitlines())
+    assert not list(cache.iterdir())
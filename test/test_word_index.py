@@ -0,0 +1,58 @@
+import re
+
+import pytest
+
+from nmr import nmr
+from nmr.word_index import WordIndex, _trie_regex
+
+INDEX = WordIndex({"a": 0, "an": 1, "and": 2, "ant": 3, "the": 4, "then": 5, "b": 6})
+
+
+@pytest.mark.parametrize(
+    "s, expected",
+    (
+        ("a", [0]),
+        ("  The AND\tb ", [4, 2, 6]),
+        (["an", "THEN"], [1, 5]),
+        ("", None),
+        ("andy", None),
+        ("a the a", None),
+        (["a an"], None),
+    ),
+)
+def test_indexes(s, expected):
+    assert INDEX.indexes(s) == expected
+
+
+def test_case_sensitive():
+    index = WordIndex({"a": 0, "B": 1}, ignore_case=False)
+    assert index.indexes("a B") == [0, 1]
+    assert index.indexes("A b") is None
+
+
+def test_trie_regex():
+    p = re.compile(_trie_regex(nmr.inverse))
+    assert all(p.fullmatch(w) for w in nmr.words)
+
+    others = {w + "s" for w in nmr.words} | {w[:-1] for w in nmr.words}
+    assert not any(p.fullmatch(w) for w in others - set(nmr.words))
+
+
+def test_finditer():
+    text = "Then-a-ant, with ants and the-the; b-an."
+    found = [(m.group(), i) for m, i in INDEX.finditer(text, "-")]
+    assert found == [("Then-a-ant", [5, 0, 3]), ("and", [2]), ("b-an", [6, 1])]
+
+    found = [m.group() for m, _ in INDEX.finditer(text, "-", min_words=2)]
+    assert found == ["Then-a-ant", "b-an"]
+
+
+def test_bytes_pattern():
+    p = INDEX.pattern(b" ", 2)
+    assert p.findall(b"an ant, and then a bee") == [b"an ant", b"and then a"]
+
+
+def test_convert():
+    assert nmr.convert("That  LUCKY") == "12"
+    assert nmr.is_name(["that", "Lucky"])
+    assert not nmr.is_name(["that", "that"])
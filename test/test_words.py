@@ -1,7 +1,9 @@
 import itertools
+import random
 
 import pytest
 
+from nmr import nmr
 from nmr.words import Words
 
 WORD_LISTS = (
@@ -51,3 +53,11 @@ def test_case(words, ignore_case):
     except ValueError as e:
         if words == ("one", "two", "three") and not ignore_case:
             assert e.args == ("Didn't recognize the following word: Three",)
+
+
+@pytest.mark.parametrize("length", (5, 200, 1000))
+def test_long_names(length):
+    rng = random.Random(length)
+    words = rng.sample(nmr.words, length)
+    number = nmr.decode_from_name(words)
+    assert nmr.encode_to_name(number) == words